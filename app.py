@@ -1,10 +1,11 @@
-from src.config import config_instance
-from src.main import create_app
+# parser worker processes import the main script again as __mp_main__, only the entry point and wsgi servers
+# importing this module build the app
+if __name__ != "__mp_main__":
+    from src.config import config_instance
+    from src.main import create_app
 
-
-app = create_app(config=config_instance())
+    app = create_app(config=config_instance())
 
 
 if __name__ == "__main__":
     app.run(host='0.0.0.0', port=8084, debug=True, extra_files=['src', 'templates', 'static'])
-
@@ -0,0 +1,17 @@
+"""
+    benchmarks behind the numbers quoted in commit messages, run them from the repository root e.g.
+
+        python -m benchmarks.follower_reload
+
+    settings which are not configured get harmless defaults, nothing is written to the configured databases
+"""
+import os
+import socket
+import tempfile
+
+_directory = tempfile.mkdtemp(prefix="jobfinders-benchmarks-")
+for _name, _value in dict(SECRET_KEY="benchmark", CLIENT_SECRET="benchmark", HOST_ADDRESSES="localhost",
+                          DEVELOPMENT_SERVER_NAME=socket.gethostname(), SNAPSHOT_PATH="", REFRESH_ENABLED="false",
+                          production_sql_db=f"sqlite:///{os.path.join(_directory, 'production.db')}",
+                          dev_sql_db=f"sqlite:///{os.path.join(_directory, 'development.db')}").items():
+    os.environ.setdefault(_name, _value)
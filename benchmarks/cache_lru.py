@@ -0,0 +1,49 @@
+"""
+    Cache get, set and eviction at 100k entries with max_size at half of them, disk writes are left out of
+    those timings and measured on their own as a flush of 20k entries followed by a warm-load of the directory
+
+        python -m benchmarks.cache_lru [entries]
+"""
+import shutil
+import sys
+import tempfile
+import time
+
+import benchmarks  # noqa: F401 settings defaults
+from src.cache import Cache
+
+FLUSHED: int = 20_000
+
+
+def main(count: int = 100_000):
+    directory = tempfile.mkdtemp(prefix="jobfinders-benchmarks-")
+    value = {"a": list(range(10))}
+    try:
+        cache = Cache(directory=directory, max_size=count // 2, flush_size=10 ** 9, flush_interval=10 ** 9)
+        started = time.perf_counter()
+        for number in range(count):
+            cache.set(f"k{number}", value)
+        # the second half of these evict
+        set_us = (time.perf_counter() - started) * 1e6 / count
+        started = time.perf_counter()
+        for number in range(count):
+            cache.get(f"k{number}")
+        get_us = (time.perf_counter() - started) * 1e6 / count
+        print(f"{count} entries: set+evict {set_us:.2f}us/op, get (50% miss) {get_us:.2f}us/op")
+        cache.clear()
+
+        cache = Cache(directory=directory, max_size=FLUSHED, flush_size=10 ** 9, flush_interval=10 ** 9)
+        for number in range(FLUSHED):
+            cache.set(f"k{number}", value)
+        started = time.perf_counter()
+        cache.flush()
+        print(f"flush of {FLUSHED} entries: {time.perf_counter() - started:.2f}s")
+        started = time.perf_counter()
+        loaded = Cache(directory=directory, max_size=FLUSHED)
+        print(f"warm-load of {len(loaded)} files: {time.perf_counter() - started:.2f}s")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
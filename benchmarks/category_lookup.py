@@ -0,0 +1,54 @@
+"""
+    cost of listing one category as the store grows, the category is held at 100 jobs while the others grow
+
+        python -m benchmarks.category_lookup
+"""
+import asyncio
+import statistics
+import time
+from typing import Callable
+
+import benchmarks  # noqa: F401 settings defaults
+from src.database.models.jobs import Job
+from src.scrappers import Scrapper
+
+SIZES: tuple[int, ...] = (1_000, 10_000, 100_000, 500_000)
+CATEGORY: str = "nursing"
+CATEGORY_SIZE: int = 100
+
+BASE = Job(search_term=CATEGORY, logo_link="logo", job_link="link", title="title", company_name="company",
+           salary="Market Related", position="Permanent", location="Cape Town",
+           updated_time="Posted 22 Aug 2023 by Agent", expires="Expires in 30 days", job_ref="ref",
+           description="description", desired_skills=["skill"])
+
+
+def median_ms(function: Callable, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1e3
+
+
+def main():
+    scrapper = Scrapper()
+    others = [term for term in scrapper.search_terms if term != CATEGORY]
+    made = 0
+    for size in SIZES:
+        batch = []
+        for number in range(made, size):
+            term = CATEGORY if number < CATEGORY_SIZE else others[number % len(others)]
+            batch.append(BASE.copy(update=dict(job_ref=f"ref{number}", search_term=term)))
+        made = size
+        asyncio.run(scrapper.manage_jobs(jobs=batch))
+
+        indexed = median_ms(lambda: scrapper.jobs_by_term(CATEGORY), runs=50)
+        scanned = median_ms(lambda: [job for job in scrapper.all_jobs() if job.search_term.casefold() == CATEGORY],
+                            runs=5)
+        print(f"{size:>7} jobs: index {indexed:.3f}ms, full scan {scanned:.1f}ms "
+              f"({len(scrapper.jobs_by_term(CATEGORY))} in category)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+    wall time of crawling one search term as the site latency grows, 22 requests: listing page 1 with 20 jobs,
+    their 20 detail pages and listing page 2 which is empty. the parser worker processes are started by a crawl of an
+    empty term beforehand so their start-up is not counted
+
+        python -m benchmarks.crawl_latency
+"""
+import asyncio
+import time
+
+import benchmarks  # noqa: F401 settings defaults
+from benchmarks.fakesite import serve
+from src.scrappers import JunctionScrapper, Scrapper
+
+LATENCIES: tuple[float, ...] = (0.01, 0.05, 0.1)
+
+
+async def crawl(base_url: str) -> tuple[int, float]:
+    """
+    :param base_url: of the fake site
+    :return: jobs found and the seconds it took
+    """
+    scrapper = Scrapper()
+    junction = JunctionScrapper(scrapper=scrapper)
+    junction._jobs_base_url = f"{base_url}jobs/"
+    junction._junction_base_url = base_url
+    # past the cache so every run goes to the site
+    scrape = JunctionScrapper.junction_scrape.__wrapped__
+    try:
+        await scrape(junction, term="empty", page_limit=1)
+        started = time.perf_counter()
+        jobs = await scrape(junction, term="it", page_limit=2)
+        return len(jobs), time.perf_counter() - started
+    finally:
+        await scrapper.close()
+
+
+def main():
+    for port, latency in enumerate(LATENCIES, start=18501):
+        count, elapsed = asyncio.run(crawl(base_url=serve(latency=latency, port=port)))
+        print(f"latency {latency * 1000:.0f}ms: {count} jobs in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+    local stand-in for careerjunction.co.za which answers every request after a fixed latency,
+    listing pages link 20 jobs and detail pages carry an ETag so recrawls can be answered with 304
+"""
+import asyncio
+import threading
+import zlib
+from datetime import date
+
+from aiohttp import web
+
+from benchmarks.synthetic import SALARIES
+
+JOBS_PER_PAGE: int = 20
+# pages listed per search term, any other term has a single page
+PAGES: dict[str, int] = {"nursing": 4, "finance": 2, "empty": 0}
+
+
+def _number(name: str) -> int:
+    return zlib.crc32(name.encode())
+
+
+def listing(term: str, page: int) -> str:
+    if page > PAGES.get(term, 1):
+        return "<html><body></body></html>"
+    items = "".join(f'<div class="job-result"><a class="show-more" href="/job-{term}-{page}-{number}">more</a></div>'
+                    for number in range(JOBS_PER_PAGE))
+    return f"<html><body>{items}</body></html>"
+
+
+def detail(name: str) -> str:
+    skills = "".join(f"<li>skill {number}</li>" for number in range(5))
+    description = "\n".join(["Responsibilities", "Do the work well.", "Requirements", "Matric",
+                             "Some paragraph text " * 20] * 4)
+    return f"""<html><body><div class="job-description"><img src="/logo.png"><h1>Title {name}</h1>
+<h2>Company {_number(name) % 7}</h2><ul><li class="salary">{SALARIES[_number(name) % len(SALARIES)]}</li>
+<li class="position">Permanent</li><li class="location">Cape Town</li>
+<li class="updated-time">Posted {date.today():%d %b %Y} by Agent</li>
+<li class="expires">Expires in {7 + _number(name) % 30} days</li><li class="cjun-job-ref">REF {name}</li></ul></div>
+<div class="job-desc-on-expired"><div class="job-details">{description}<ul>{skills}</ul></div></div></body></html>"""
+
+
+def make_app(latency: float) -> web.Application:
+    async def handler(request: web.Request) -> web.Response:
+        await asyncio.sleep(latency)
+        path = request.path.strip("/")
+        if path.startswith("jobs/"):
+            return web.Response(text=listing(term=path[5:], page=int(request.query.get("page", "1"))),
+                                content_type="text/html")
+        etag = f'"{_number(path) & 0xffff}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304)
+        return web.Response(text=detail(path), content_type="text/html", headers={"ETag": etag})
+
+    app = web.Application()
+    app.router.add_get("/{tail:.*}", handler)
+    return app
+
+
+def serve(latency: float, port: int) -> str:
+    """
+        starts the site on a daemon thread with its own event loop
+    :param latency: seconds before every response
+    :param port:
+    :return: base url of the site
+    """
+    loop = asyncio.new_event_loop()
+    runner = web.AppRunner(make_app(latency=latency))
+    loop.run_until_complete(runner.setup())
+    loop.run_until_complete(web.TCPSite(runner, "127.0.0.1", port).start())
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return f"http://127.0.0.1:{port}/"
@@ -0,0 +1,42 @@
+"""
+    cost of a follower picking up a new snapshot when the leader changed a small share of the jobs
+
+        python -m benchmarks.follower_reload [jobs] [changed]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+import benchmarks  # noqa: F401 settings defaults
+from benchmarks.synthetic import make_jobs
+from src.scrappers import Scrapper
+
+
+def main(count: int = 20_000, changed: int = 200):
+    path = os.path.join(tempfile.mkdtemp(prefix="jobfinders-benchmarks-"), "jobs.snapshot")
+    leader, follower = Scrapper(), Scrapper()
+    leader.snapshot_path = follower.snapshot_path = path
+    asyncio.run(leader.manage_jobs(jobs=make_jobs(count=count)))
+    leader.save_snapshot()
+
+    started = time.perf_counter()
+    follower.reload_snapshot()
+    print(f"first load, {count} jobs decoded and indexed: {time.perf_counter() - started:.2f}s")
+
+    # the leader recrawls: some jobs change, as many expire and as many are new
+    asyncio.run(leader.manage_jobs(jobs=make_jobs(count=changed, seed=2)))
+    for ref in list(leader.jobs)[changed:2 * changed]:
+        leader.remove_job(ref=ref)
+    asyncio.run(leader.manage_jobs(jobs=make_jobs(count=changed, seed=3, start=count)))
+    leader.save_snapshot()
+
+    started = time.perf_counter()
+    updated = follower.reload_snapshot()
+    print(f"reload after {changed} changed, {changed} removed, {changed} new: {updated} jobs indexed "
+          f"in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,47 @@
+"""
+    time the scrapper lock is held while the store is saved to a snapshot, against the whole save
+
+        python -m benchmarks.snapshot_save [jobs]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+import benchmarks  # noqa: F401 settings defaults
+from benchmarks.synthetic import make_jobs
+from src.scrappers import Scrapper
+
+
+class TimedLock:
+    """wraps the scrapper lock and adds up how long it was held"""
+
+    def __init__(self, lock):
+        self.lock = lock
+        self.held = 0.0
+        self._acquired: list[float] = []
+
+    def __enter__(self):
+        self.lock.acquire()
+        self._acquired.append(time.perf_counter())
+        return self
+
+    def __exit__(self, *args):
+        self.held += time.perf_counter() - self._acquired.pop()
+        self.lock.release()
+
+
+def main(count: int = 20_000):
+    scrapper = Scrapper()
+    scrapper.snapshot_path = os.path.join(tempfile.mkdtemp(prefix="jobfinders-benchmarks-"), "jobs.snapshot")
+    asyncio.run(scrapper.manage_jobs(jobs=make_jobs(count=count)))
+
+    scrapper._lock = lock = TimedLock(scrapper._lock)
+    started = time.perf_counter()
+    scrapper.save_snapshot()
+    print(f"save of {count} jobs: {time.perf_counter() - started:.2f}s, lock held {lock.held * 1e3:.1f}ms")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,39 @@
+"""
+    memory held by the JobStore per job, measured with tracemalloc over synthetic jobs with about 1.5 KB
+    descriptions and 6 skills each, and the cost of reading the description html of a stored job
+
+        python -m benchmarks.store_memory [jobs]
+"""
+import gc
+import sys
+import time
+import tracemalloc
+
+import benchmarks  # noqa: F401 settings defaults
+from benchmarks.synthetic import iter_jobs
+from src.scrappers.store import JobStore
+from src.utils import format_reference
+
+READS: int = 1_000
+
+
+def main(count: int = 100_000):
+    tracemalloc.start()
+    store = JobStore()
+    for job in iter_jobs(count=count):
+        store[format_reference(ref=job.job_ref)] = job
+    del job
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{count} jobs: {current / count:.0f} bytes/job ({current / 2 ** 20:.1f} MiB)")
+
+    refs = list(store)[:READS]
+    started = time.perf_counter()
+    for ref in refs:
+        store[ref].description_html
+    print(f"description html read: {(time.perf_counter() - started) * 1e6 / len(refs):.1f}us")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
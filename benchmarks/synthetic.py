@@ -0,0 +1,38 @@
+import random
+from datetime import date
+from typing import Iterator
+
+from src.database.models.jobs import Job
+
+SEARCH_TERMS: tuple[str, ...] = ("information-technology", "office-admin", "agriculture", "engineering", "nursing",
+                                 "finance", "programming", "education")
+SALARIES: tuple[str, ...] = ("R25 000.00 - R41 667.00 Per Month", "Market Related", "R 300 000 per annum")
+
+
+def job_fields(number: int, rnd: random.Random, words: list[str]) -> dict:
+    """
+        scraped fields of one synthetic job, descriptions are 12 lines of random words under two headings
+    :param number:
+    :param rnd:
+    :param words: vocabulary
+    :return:
+    """
+    lines = [" ".join(rnd.choices(words, k=14)) for _ in range(12)]
+    description = "\n".join(["Responsibilities", *lines[:8], "Requirements", *lines[8:]])
+    return dict(search_term=rnd.choice(SEARCH_TERMS), logo_link=f"https://cdn.example/logo/{number % 4000}.png",
+                job_link=f"https://www.careerjunction.co.za/job-{number}", title=" ".join(rnd.choices(words, k=5)),
+                company_name=f"Company {rnd.randrange(4000)} (Pty) Ltd", salary=rnd.choice(SALARIES),
+                position=rnd.choice(("Permanent", "Contract", "Temporary")), location=f"Town {rnd.randrange(300)}",
+                updated_time=f"Posted {date.today():%d %b %Y} by Agent {number % 500}", expires="Expires in 30 days",
+                job_ref=f"REF {number}", description=description, desired_skills=rnd.choices(words[:200], k=6))
+
+
+def iter_jobs(count: int, seed: int = 1, start: int = 0) -> Iterator[Job]:
+    rnd = random.Random(seed)
+    words = [f"word{number}" for number in range(3000)]
+    for number in range(start, start + count):
+        yield Job(**job_fields(number=number, rnd=rnd, words=words))
+
+
+def make_jobs(count: int, seed: int = 1, start: int = 0) -> list[Job]:
+    return list(iter_jobs(count=count, seed=seed, start=start))
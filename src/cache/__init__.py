@@ -1,30 +1,72 @@
+import asyncio
+import atexit
 import os
+import threading
 import time
 import pickle
 import functools
+from collections import OrderedDict
+from src.config import config_instance
 from src.utils import generate_cache_key
 
 
 class Cache:
-    def __init__(self, directory="./cache", max_size=1023, default_ttl=60 * 60):
+    """
+    **Cache**
+        LRU cache with per entry ttl, bounded both by number of entries and by the pickled size of the values
+
+        the on disk directory is read once at startup, writes are buffered and flushed in batches, each file
+        being replaced atomically so a crash never leaves a partially written entry behind
+    """
+
+    def __init__(self, directory="./cache", max_size=1023, max_bytes=64 * 1024 * 1024, default_ttl=60 * 60,
+                 flush_size=64, flush_interval=5.0):
         self.directory = directory
         self.max_size = max_size
+        self.max_bytes = max_bytes
         self.default_ttl = default_ttl
-        self.cache = {}
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        # key -> (pickled value, timestamp, ttl), least recently used first
+        self.cache: OrderedDict[str, tuple[bytes, float, int | None]] = OrderedDict()
+        self.total_bytes = 0
+        # keys written (True) or removed (False) since the last flush
+        self._dirty: dict[str, bool] = {}
+        self._last_flush = time.time()
+        self._lock = threading.RLock()
+        # flushes write files outside _lock, one at a time
+        self._flush_lock = threading.Lock()
         if not os.path.exists(directory):
             os.makedirs(directory)
+        self.warm_load()
+        atexit.register(self.flush)
 
-    def get(self, key):
-        now = time.time()
-        if key not in self.cache:
-            self.load(key=key)
-        if key not in self.cache:
-            return None
-
-        value, timestamp, ttl = self.cache[key]
-        if ttl is not None and now - timestamp > ttl:
-            del self.cache[key]
-            return None
+    def _expired(self, timestamp: float, ttl: int | None, now: float) -> bool:
+        return ttl is not None and now - timestamp > ttl
+
+    def _put(self, key, entry):
+        previous = self.cache.pop(key, None)
+        if previous is not None:
+            self.total_bytes -= len(previous[0])
+        self.cache[key] = entry
+        self.total_bytes += len(entry[0])
+
+    def _discard(self, key):
+        entry = self.cache.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= len(entry[0])
+            self._dirty[key] = False
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self.cache.get(key)
+            if entry is None:
+                return default
+            value, timestamp, ttl = entry
+            if self._expired(timestamp, ttl, time.time()):
+                self._discard(key)
+                return default
+            self.cache.move_to_end(key)
         return pickle.loads(value)
 
     def set(self, key, value, ttl=None):
@@ -32,77 +74,184 @@ class Cache:
         if ttl is None:
             ttl = self.default_ttl
         value_data = pickle.dumps(value)
-        self.cache[key] = (value_data, now, ttl)
-        self.persist(key=key)
-        if len(self.cache) > self.max_size:
+        with self._lock:
+            self._put(key, (value_data, now, ttl))
+            self._dirty[key] = True
             self._evict()
+            due = len(self._dirty) >= self.flush_size or now - self._last_flush >= self.flush_interval
+        # flushed after the lock is released, flush takes it again only while collecting the dirty keys
+        if due:
+            self.flush()
 
     def __contains__(self, key):
-        now = time.time()
-        if key not in self.cache:
-            return False
-        value, timestamp, ttl = self.cache[key]
-        if ttl is not None and now - timestamp > ttl:
-            del self.cache[key]
-            return False
-        return True
+        with self._lock:
+            entry = self.cache.get(key)
+            if entry is None:
+                return False
+            if self._expired(entry[1], entry[2], time.time()):
+                self._discard(key)
+                return False
+            return True
 
     def _evict(self):
-        if not self.cache:
-            return
-        oldest_key = min(self.cache, key=lambda x: self.cache[x][1])
-        del self.cache[oldest_key]
+        # least recently used entries go first, the newest entry is kept even if it alone exceeds max_bytes
+        while len(self.cache) > 1 and (len(self.cache) > self.max_size or self.total_bytes > self.max_bytes):
+            self._discard(next(iter(self.cache)))
 
     def clear(self):
-        self.cache.clear()
+        with self._lock:
+            self.cache.clear()
+            self.total_bytes = 0
+            self._dirty.clear()
 
     def __delitem__(self, key):
-        del self.cache[key]
-        cache_file = os.path.join(self.directory, f"{key}.pkl")
-        if os.path.exists(cache_file):
-            os.remove(cache_file)
+        with self._lock:
+            if key not in self.cache:
+                raise KeyError(key)
+            self._discard(key)
+
+    def _path(self, key) -> str:
+        return os.path.join(self.directory, f"{key}.pkl")
 
     def persist(self, key):
-        if key not in self.cache:
-            return
-        value_data, timestamp, ttl = self.cache[key]
-        if ttl is None:
-            ttl = self.default_ttl
-        cache_file = os.path.join(self.directory, f"{key}.pkl")
-        with open(cache_file, "wb") as f:
+        """
+            writes a single entry, the file is replaced atomically
+        :param key:
+        :return:
+        """
+        with self._lock:
+            if key not in self.cache:
+                return
+            value_data, timestamp, ttl = self.cache[key]
+        cache_file = self._path(key)
+        tmp_file = f"{cache_file}.tmp"
+        with open(tmp_file, "wb") as f:
             pickle.dump((value_data, timestamp, ttl), f)
+        os.replace(tmp_file, cache_file)
+
+    def flush(self):
+        """
+            writes back every entry changed since the last flush and removes the files of evicted entries, the
+            files are written without holding the cache lock so readers are not held up by the disk
+        :return:
+        """
+        with self._flush_lock:
+            with self._lock:
+                dirty, self._dirty = self._dirty, {}
+                self._last_flush = time.time()
+            for key, written in dirty.items():
+                try:
+                    if written:
+                        self.persist(key=key)
+                    elif os.path.exists(self._path(key)):
+                        os.remove(self._path(key))
+                except OSError:
+                    # retried on the next flush
+                    with self._lock:
+                        self._dirty.setdefault(key, written)
+
+    def warm_load(self) -> int:
+        """
+            loads every unexpired entry from the cache directory, oldest first so the LRU order follows the
+            timestamps, expired files are removed
+        :return: number of entries loaded
+        """
+        now = time.time()
+        entries = []
+        with os.scandir(self.directory) as files:
+            for file in files:
+                if not file.name.endswith(".pkl") or not file.is_file():
+                    continue
+                try:
+                    with open(file.path, "rb") as f:
+                        value_data, timestamp, ttl = pickle.load(f)
+                except (OSError, EOFError, pickle.UnpicklingError, ValueError):
+                    continue
+                key = file.name[:-len(".pkl")]
+                if self._expired(timestamp, ttl, now):
+                    self._dirty[key] = False
+                    continue
+                entries.append((timestamp, key, (value_data, timestamp, ttl)))
+
+        with self._lock:
+            for _, key, entry in sorted(entries, key=lambda item: item[0]):
+                self._put(key, entry)
+            self._evict()
+        return len(entries)
 
     def load(self, key):
-        cache_file = os.path.join(self.directory, f"{key}.pkl")
+        cache_file = self._path(key)
         if not os.path.exists(cache_file):
             return
         with open(cache_file, "rb") as f:
             value_data, timestamp, ttl = pickle.load(f)
-            self.cache[key] = (value_data, timestamp, ttl)
+        with self._lock:
+            self._put(key, (value_data, timestamp, ttl))
 
     def __len__(self):
         return len(self.cache)
 
     def __iter__(self):
-        return iter(self.cache)
+        return iter(list(self.cache))
 
     def __repr__(self):
-        return f"Cache({len(self)}, max_size={self.max_size}, default_ttl={self.default_ttl})"
+        return (f"Cache({len(self)}, max_size={self.max_size}, max_bytes={self.max_bytes}, "
+                f"default_ttl={self.default_ttl})")
+
+
+def create_cache(backend: str = "memory", directory: str = "./cache", max_bytes: int = 64 * 1024 * 1024):
+    """
+        cache backend by name, the sqlite backend lets every worker process on a host share one cache
+    :param backend: memory or sqlite
+    :param directory:
+    :param max_bytes:
+    :return:
+    """
+    if backend == "sqlite":
+        from src.cache.sqlite import SQLiteCache
+        return SQLiteCache(path=os.path.join(directory, "cache.sqlite3"), max_bytes=max_bytes)
+    if backend == "memory":
+        return Cache(directory=directory, max_bytes=max_bytes)
+    raise ValueError(f"Unknown cache backend : {backend}")
+
+
+settings = config_instance()
+route_cache = create_cache(backend=settings.CACHE_BACKEND, directory=settings.CACHE_DIRECTORY,
+                           max_bytes=settings.CACHE_MAX_BYTES)
 
 
-route_cache = Cache()
+# running calls per event loop and cache key, concurrent callers of the same key await the same task
+_in_flight: dict[tuple[int, str], asyncio.Task] = {}
 
 
 def cached(f):
+    """
+        caches the result of a coroutine, concurrent misses for the same call are coalesced so a burst
+        of identical calls runs f only once, empty results are returned but not cached
+    :param f:
+    :return:
+    """
+    async def call_and_store(cache_key, *args, **kwargs):
+        result = await f(*args, **kwargs)
+        if result:
+            # a set may write to disk, the batched flush of Cache or the sqlite write, keep it off the event loop
+            await asyncio.to_thread(route_cache.set, cache_key, result)
+        return result
+
     @functools.wraps(f)
     async def decorated_function(*args, **kwargs):
         cache_key = generate_cache_key(f, *args, **kwargs)
-        print(f" cache key : {cache_key}")
         cached_result = route_cache.get(cache_key)
         if cached_result:
             return cached_result
-        result = await f(*args, **kwargs)
-        route_cache.set(cache_key, result)
-        return result
+
+        flight_key = (id(asyncio.get_running_loop()), cache_key)
+        task = _in_flight.get(flight_key)
+        if task is None:
+            task = asyncio.ensure_future(call_and_store(cache_key, *args, **kwargs))
+            _in_flight[flight_key] = task
+            task.add_done_callback(lambda _: _in_flight.pop(flight_key, None))
+        # a cancelled caller must not cancel the call the other callers are waiting on
+        return await asyncio.shield(task)
 
     return decorated_function
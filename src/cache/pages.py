@@ -0,0 +1,90 @@
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+from flask import Response, make_response, request
+
+
+class PageCache:
+    """
+    **PageCache**
+        rendered responses kept in memory and keyed by endpoint, view arguments, query string and
+        a data generation, a crawl bumps the generation so stale pages are never looked up again
+        and simply age out of the LRU
+
+        responses carry a strong ETag computed from the body, If-None-Match is answered with 304
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[bytes, str, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def get(self, key: tuple) -> tuple[bytes, str, str] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key: tuple, entry: tuple[bytes, str, str]):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def request_key(generation: Hashable) -> tuple:
+        return (request.endpoint, tuple(sorted(request.view_args.items())),
+                tuple(sorted(request.args.items(multi=True))), generation)
+
+    def cached(self, generation: Callable[..., Hashable | None]):
+        """
+            caches successful responses of an async view
+        :param generation: called with the view arguments, returns the data generation the page is built from
+            or None when the page must not be cached
+        :return:
+        """
+        def decorator(f):
+            @functools.wraps(f)
+            async def decorated_function(*args, **kwargs):
+                current = generation(**kwargs)
+                if current is None:
+                    return await f(*args, **kwargs)
+
+                key = self.request_key(generation=current)
+                entry = self.get(key)
+                if entry is None:
+                    response = make_response(await f(*args, **kwargs))
+                    if response.status_code != 200 or response.direct_passthrough:
+                        return response
+                    body = response.get_data()
+                    entry = (body, response.mimetype, hashlib.blake2b(body, digest_size=16).hexdigest())
+                    self.set(key, entry)
+
+                body, mimetype, etag = entry
+                response = Response(body, mimetype=mimetype)
+                response.set_etag(etag)
+                return response.make_conditional(request)
+
+            return decorated_function
+
+        return decorator
+
+
+page_cache = PageCache()
@@ -0,0 +1,121 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+
+class SQLiteCache:
+    """
+    **SQLiteCache**
+        cache backend shared by every worker process on a host, entries live in a single sqlite database
+        in WAL mode so readers never block the writer and a value stored by one worker is a hit for all
+
+        same interface as Cache, eviction is least recently used bounded by entry count and total bytes
+    """
+
+    def __init__(self, path="./cache/cache.sqlite3", max_size=1023, max_bytes=64 * 1024 * 1024,
+                 default_ttl=60 * 60, evict_every=64, touch_interval=60.0):
+        self.path = path
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.evict_every = evict_every
+        # last access times are only rewritten when older than this, keeping reads read-only most of the time
+        self.touch_interval = touch_interval
+        self._local = threading.local()
+        self._writes = 0
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        with self.connection as connection:
+            connection.execute("""CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL,
+                created REAL NOT NULL, expires REAL, accessed REAL NOT NULL)""")
+            connection.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)")
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """
+            one connection per thread, sqlite connections must not be shared between threads
+        :return:
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, key, default=None):
+        now = time.time()
+        row = self.connection.execute("SELECT value, expires, accessed FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return default
+        value, expires, accessed = row
+        if expires is not None and expires < now:
+            self.connection.execute("DELETE FROM cache WHERE key = ? AND expires < ?", (key, now))
+            return default
+        if now - accessed > self.touch_interval:
+            self.connection.execute("UPDATE cache SET accessed = ? WHERE key = ?", (now, key))
+        return pickle.loads(value)
+
+    def set(self, key, value, ttl=None):
+        now = time.time()
+        if ttl is None:
+            ttl = self.default_ttl
+        value_data = pickle.dumps(value)
+        expires = now + ttl if ttl is not None else None
+        self.connection.execute("INSERT OR REPLACE INTO cache (key, value, size, created, expires, accessed) "
+                                "VALUES (?, ?, ?, ?, ?, ?)", (key, value_data, len(value_data), now, expires, now))
+        self._writes += 1
+        if self._writes % self.evict_every == 0:
+            self._evict()
+
+    def __contains__(self, key):
+        row = self.connection.execute("SELECT expires FROM cache WHERE key = ?", (key,)).fetchone()
+        return row is not None and (row[0] is None or row[0] >= time.time())
+
+    def _evict(self):
+        """
+            drops expired entries and then the least recently used ones until both limits are met
+        :return:
+        """
+        connection = self.connection
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.execute("DELETE FROM cache WHERE expires < ?", (time.time(),))
+            count, total_bytes = connection.execute("SELECT count(*), total(size) FROM cache").fetchone()
+            if count <= self.max_size and total_bytes <= self.max_bytes:
+                return
+            excess_count, excess_bytes = count - self.max_size, total_bytes - self.max_bytes
+            victims = []
+            for key, size in connection.execute("SELECT key, size FROM cache ORDER BY accessed"):
+                if excess_count <= 0 and excess_bytes <= 0:
+                    break
+                victims.append((key,))
+                excess_count -= 1
+                excess_bytes -= size
+            connection.executemany("DELETE FROM cache WHERE key = ?", victims)
+
+    def flush(self):
+        # every write is already durable
+        pass
+
+    def clear(self):
+        self.connection.execute("DELETE FROM cache")
+
+    def __delitem__(self, key):
+        if self.connection.execute("DELETE FROM cache WHERE key = ?", (key,)).rowcount == 0:
+            raise KeyError(key)
+
+    def __len__(self):
+        return self.connection.execute("SELECT count(*) FROM cache").fetchone()[0]
+
+    def __iter__(self):
+        return iter([key for key, in self.connection.execute("SELECT key FROM cache ORDER BY accessed")])
+
+    def __repr__(self):
+        return (f"SQLiteCache({self.path}, max_size={self.max_size}, max_bytes={self.max_bytes}, "
+                f"default_ttl={self.default_ttl})")
@@ -19,6 +19,41 @@ class Settings(BaseSettings):
     DEVELOPMENT_SERVER_NAME: str = Field(default="DESKTOP-T9V7F59")
     HOST_ADDRESSES: str = Field(..., env='HOST_ADDRESSES')
     MYSQL_SETTINGS: MySQLSettings = MySQLSettings()
+    # html.parser, lxml or selectolax, PARSER_WORKERS=0 parses on the event loop thread
+    PARSER_BACKEND: str = Field(default="html.parser")
+    PARSER_WORKERS: int | None = Field(default=None)
+    # background: serve requests immediately and crawl on a background thread, blocking: crawl before serving
+    STARTUP_MODE: str = Field(default="background")
+    SEED_FROM_DATABASE: bool = Field(default=False)
+    # jobs found by crawls and refreshes are upserted into the database, which SEED_FROM_DATABASE reads at boot
+    STORE_TO_DATABASE: bool = Field(default=True)
+    # with a lock file only one worker process on the host crawls, the others follow the snapshot it writes
+    CRAWL_LOCK_PATH: str | None = Field(default=None)
+    FOLLOW_INTERVAL: float = Field(default=30.0)
+    # job store snapshot restored at boot and rewritten after every crawl, empty to disable
+    SNAPSHOT_PATH: str = Field(default="./jobs.snapshot")
+    # stored jobs are not fetched again for this many seconds, older ones are revalidated with a conditional GET
+    REVALIDATE_AFTER: int = Field(default=24 * 60 * 60)
+    # listing pages per search term are read until this share of a page is known jobs or the budget runs out
+    CRAWL_MAX_PAGES: int = Field(default=10)
+    CRAWL_KNOWN_RATIO: float = Field(default=0.8)
+    # after the warm-up each search term is recrawled every REFRESH_MIN_INTERVAL (busiest)
+    # to REFRESH_MAX_INTERVAL (no traffic) seconds
+    REFRESH_ENABLED: bool = Field(default=True)
+    REFRESH_MIN_INTERVAL: int = Field(default=30 * 60)
+    REFRESH_MAX_INTERVAL: int = Field(default=6 * 60 * 60)
+    # shared secret the cron caller sends in the X-Cron-Secret header to trigger refreshes, unset disables triggers
+    CRON_SECRET: str | None = Field(default=None)
+    # memory: per process cache, sqlite: one cache shared by every worker on the host
+    CACHE_BACKEND: str = Field(default="memory")
+    CACHE_DIRECTORY: str = Field(default="./cache")
+    CACHE_MAX_BYTES: int = Field(default=64 * 1024 * 1024)
+    # database connections kept open per process, up to DB_MAX_OVERFLOW more are opened under load and
+    # a checkout waits DB_POOL_TIMEOUT seconds once all are taken
+    DB_POOL_SIZE: int = Field(default=5)
+    DB_MAX_OVERFLOW: int = Field(default=10)
+    DB_POOL_TIMEOUT: float = Field(default=30.0)
+    DB_POOL_RECYCLE: int = Field(default=60 * 60)
 
     class Config:
         env_file = '.env.developer'
@@ -1,6 +1,7 @@
 from flask import Flask
+from sqlalchemy.orm import Session, scoped_session
 
-from src.database.sql import Session
+from src.database.sql import scoped_sessions
 from src.logger import init_logger
 
 
@@ -10,15 +11,17 @@ class Controllers:
             registers controllers
     """
 
-    def __init__(self, session_maker=Session):
-        self.sessions = [session_maker() for _ in range(20)]
+    def __init__(self, session_maker: scoped_session = scoped_sessions):
+        self.session_maker = session_maker
         self.logger = init_logger(self.__class__.__name__)
 
     def get_session(self) -> Session:
-        if self.sessions:
-            return self.sessions.pop()
-        self.sessions = [Session() for _ in range(20)]
-        return self.get_session()
+        """
+            session of the current request or thread, sessions are created on first use and reused until the
+            request ends, closing one returns its connection to the engine pool
+        :return:
+        """
+        return self.session_maker()
 
     def setup_error_handler(self, app: Flask):
         # app.add_url_rule("")
@@ -33,8 +36,5 @@ class Controllers:
         self.setup_error_handler(app=app)
 
         session_maker = app.config.get('session_maker')
-        session_limit = app.config.get('session_limit')
-
-        if session_maker and session_limit:
-            self.sessions = [session_maker() for _ in range(session_limit)]
-
+        if session_maker:
+            self.session_maker = session_maker
@@ -1,35 +1,203 @@
+import json
+import math
+import uuid
+from collections import Counter, defaultdict
+from datetime import date
+from typing import Iterator
+
 from flask import Flask
+from sqlalchemy import bindparam, or_, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from src.database.models import Job
 from src.database.sql.jobs import JobsORM
+from src.scrappers.store import CompactJob
+from src.utils import parse_salary
 from src.controllers.controller import Controllers
 
+# dialects with a native upsert, others fall back to separate inserts and updates
+UPSERT_INSERTS = {"sqlite": sqlite_insert, "postgresql": postgresql_insert, "mysql": mysql_insert}
+# every column except the keys, an existing row is only rewritten when one of these changed
+UPDATE_COLUMNS: tuple[str, ...] = tuple(column.name for column in JobsORM.__table__.columns
+                                        if column.name not in ("job_id", "job_ref"))
+
 
 class StorageController(Controllers):
 
     def __init__(self):
         super().__init__()
-        self.jobs: list[Job] = []
+        self.jobs: list[CompactJob] = []
 
-    def load_jobs_from_database(self) -> list[Job]:
+    def stream_jobs_from_database(self, batch_size: int = 1000, today: date | None = None,
+                                  include_expired: bool = False) -> Iterator[list[CompactJob]]:
         """
-            will load all the jobs from database then return them
-        :return:
+            reads stored jobs batch_size rows at a time, each batch becomes CompactJob records before the next
+            one is fetched so memory held by the loader stays flat however large the table grows
+
+            rows are streamed as plain tuples past the ORM identity map, descriptions are compressed by
+            CompactJob as soon as their batch arrives
+        :param batch_size: rows per fetch
+        :param today: jobs which expired before this day are skipped, defaults to the current date
+        :param include_expired: load expired jobs as well
+        :return: batches of jobs
         """
+        table = JobsORM.__table__
+        statement = select(table)
+        if not include_expired:
+            # jobs whose expiry could not be parsed are kept, the expiry index never evicts them either
+            statement = statement.where(or_(table.c.expiration_date >= (today or date.today()),
+                                            table.c.expiration_date.is_(None)))
         with self.get_session() as session:
-            # TODO in future maybe load only jobs which are not expired
-            jobs_list = session.query(JobsORM).filter().all()
-            return [Job(**job.to_dict()) for job in jobs_list if job] if jobs_list else []
+            result = session.execute(statement.execution_options(yield_per=batch_size))
+            for rows in result.partitions():
+                yield [self.compact_job(row=row._mapping) for row in rows]
+
+    @staticmethod
+    def compact_job(row) -> CompactJob:
+        skills = row['desired_skills']
+        return CompactJob(**{**row, 'desired_skills': json.loads(skills) if skills else None})
+
+    def load_jobs_from_database(self) -> list[CompactJob]:
+        """
+            will load all the jobs which have not expired from database then return them
+        :return:
+        """
+        return [job for batch in self.stream_jobs_from_database() for job in batch]
 
-    def store_jobs_to_database(self, jobs: list[Job]):
+    @staticmethod
+    def job_row(job: Job | CompactJob) -> dict:
+        """
+            column values of a job as stored in the jobs table
+        :param job:
+        :return:
         """
-            this will either create new records on database or update existing ones
+        data = job.dict()
+        row = {column.name: data.get(column.name) for column in JobsORM.__table__.columns}
+        skills = data.get('desired_skills')
+        row['desired_skills'] = json.dumps(list(skills)) if skills is not None else None
+        return row
+
+    def store_jobs_to_database(self, jobs: list[Job | CompactJob], chunk_size: int = 500) -> dict[str, int]:
+        """
+            this will either create new records on database or update existing ones, keyed on job_ref
+
+            jobs are written chunk_size at a time, the stored rows of a chunk are read in one query and
+            compared so unchanged jobs are skipped and changed jobs only have their changed columns rewritten,
+            rows are then written with one upsert per set of changed columns
         :param jobs:
+        :param chunk_size: jobs per query and transaction
+        :return: number of jobs inserted, updated and unchanged
+        """
+        # the last copy of a job wins when a crawl returns it twice
+        rows = list({row['job_ref']: row for row in (self.job_row(job) for job in jobs if job)}.values())
+        table = JobsORM.__table__
+        counts = Counter(inserted=0, updated=0, unchanged=0)
+        with self.get_session() as session:
+            for start in range(0, len(rows), chunk_size):
+                chunk = rows[start:start + chunk_size]
+                stored = {row.job_ref: row._mapping for row in session.execute(
+                    select(table).where(table.c.job_ref.in_([row['job_ref'] for row in chunk])))}
+
+                groups: dict[tuple[bool, tuple[str, ...]], list[dict]] = defaultdict(list)
+                for row in chunk:
+                    current = stored.get(row['job_ref'])
+                    if current is None:
+                        row['job_id'] = row['job_id'] or uuid.uuid4().hex
+                        groups[(True, UPDATE_COLUMNS)].append(row)
+                        counts['inserted'] += 1
+                        continue
+                    changed = tuple(column for column in UPDATE_COLUMNS if self.changed(row[column], current[column]))
+                    if not changed:
+                        counts['unchanged'] += 1
+                        continue
+                    row['job_id'] = current['job_id']
+                    groups[(False, changed)].append(row)
+                    counts['updated'] += 1
+
+                connection = session.connection()
+                for (new, columns), group in groups.items():
+                    self._write_rows(connection=connection, rows=group, columns=columns, new=new)
+                session.commit()
+        self.logger.info(f"Stored {len(rows)} jobs : {dict(counts)}")
+        return dict(counts)
+
+    @staticmethod
+    def changed(value, stored) -> bool:
+        """
+            True when a column value differs from the stored one, floats are compared with a tolerance since
+            salary columns created as single precision FLOAT on MySQL round them e.g. 108333.33 to 108333.3
+        :param value:
+        :param stored:
         :return:
         """
+        if isinstance(value, float) and isinstance(stored, (float, int)):
+            return not math.isclose(value, stored, rel_tol=1e-6)
+        return value != stored
+
+    @staticmethod
+    def _write_rows(connection, rows: list[dict], columns: tuple[str, ...], new: bool):
+        """
+            writes a group of rows with one executemany, existing rows only get the given columns set, the
+            upsert also covers rows another worker inserted after the chunk was read
+        :param connection:
+        :param rows: complete rows
+        :param columns: columns to set on rows which already exist
+        :param new: True when the rows were not stored when the chunk was read
+        :return:
+        """
+        table = JobsORM.__table__
+        dialect = connection.dialect.name
+        insert = UPSERT_INSERTS.get(dialect)
+        if insert is not None:
+            statement = insert(table)
+            if dialect == "mysql":
+                statement = statement.on_duplicate_key_update({column: statement.inserted[column] for column in columns})
+            else:
+                statement = statement.on_conflict_do_update(
+                    index_elements=[table.c.job_ref], set_={column: statement.excluded[column] for column in columns})
+            connection.execute(statement, rows)
+        elif new:
+            connection.execute(table.insert(), rows)
+        else:
+            statement = (update(table).where(table.c.job_ref == bindparam('ref'))
+                         .values({column: bindparam(column) for column in columns}))
+            connection.execute(statement, [dict(row, ref=row['job_ref']) for row in rows])
+
+    def backfill_salaries(self, batch_size: int = 1000) -> int:
+        """
+            parses the salary of stored jobs which do not have normalized amounts yet, rows are read in
+            job_ref order one batch at a time and each batch is written back with a single executemany
+        :param batch_size:
+        :return: number of jobs updated
+        """
+        statement = (update(JobsORM.__table__)
+                     .where(JobsORM.__table__.c.job_ref == bindparam('ref'))
+                     .values(salary_min=bindparam('salary_min'), salary_max=bindparam('salary_max'),
+                             salary_period=bindparam('salary_period')))
+        updated = 0
+        last_ref = ''
         with self.get_session() as session:
-            session.bulk_save_objects([JobsORM(**job.disp_dict()) for job in jobs if job], return_defaults=True)
-            session.commit()
+            while True:
+                rows = (session.query(JobsORM.job_ref, JobsORM.salary)
+                        .filter(JobsORM.salary_period.is_(None), JobsORM.job_ref > last_ref)
+                        .order_by(JobsORM.job_ref).limit(batch_size).all())
+                if not rows:
+                    break
+                last_ref = rows[-1].job_ref
+                parameters = []
+                for job_ref, salary in rows:
+                    salary_min, salary_max, salary_period = parse_salary(salary=salary)
+                    if salary_period is not None:
+                        parameters.append(dict(ref=job_ref, salary_min=salary_min, salary_max=salary_max,
+                                               salary_period=salary_period))
+                if parameters:
+                    session.execute(statement, parameters)
+                    session.commit()
+                    updated += len(parameters)
+                self.logger.info(f"Backfilled salaries up to {last_ref}, {updated} jobs updated")
+        return updated
 
     def init_app(self, app: Flask):
         self.jobs = self.load_jobs_from_database()
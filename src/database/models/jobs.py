@@ -1,7 +1,6 @@
-import re
-from datetime import datetime, timedelta, date
-from pydantic import BaseModel, validator
-from src.utils import format_reference
+from datetime import date
+from pydantic import BaseModel, validator, root_validator
+from src.utils import format_reference, parse_salary, format_description, parse_job_dates
 
 
 # noinspection PyMethodParameters
@@ -22,35 +21,45 @@ class Job(BaseModel):
     description: str | None
     desired_skills: list[str] | None
 
+    # normalized monthly amounts parsed from salary at ingest
+    salary_min: float | None
+    salary_max: float | None
+    salary_period: str | None
+    # description rendered to html once at ingest, job pages emit it as is
+    description_html: str | None
+    # parsed from updated_time and expires once at ingest, None when the scraped text holds no date
+    posted_date: date | None
+    expiration_date: date | None
+
     @validator('job_ref', pre=True)
     def format_job_ref(cls, value):
         # Remove spaces and convert to lowercase
         return format_reference(ref=value)
 
-    @property
-    def posted_date(self) -> date:
-        """
-        Validate and convert the posted_date string to a date object.
+    @root_validator(skip_on_failure=True)
+    def normalize_salary(cls, values):
+        if values.get('salary_period') is None:
+            salary_min, salary_max, salary_period = parse_salary(salary=values.get('salary'))
+            values.update(salary_min=salary_min, salary_max=salary_max, salary_period=salary_period)
+        return values
 
-        :param value: The posted_date string to be validated.
-        :return: The validated and converted date object.
-        """
-        # Assume the format is "Posted {day} {month abbreviation} {year} by {author}"
-        try:
-            posted_date_str = self.updated_time.split("by")[0].strip()[len("Posted "):]
-            posted_date = datetime.strptime(posted_date_str, "%d %b %Y").date()
-            return posted_date
-        except ValueError:
-            raise ValueError("Invalid posted_date format")
+    @root_validator(skip_on_failure=True)
+    def parse_dates(cls, values):
+        if values.get('posted_date') is None and values.get('expiration_date') is None:
+            values['posted_date'], values['expiration_date'] = parse_job_dates(
+                updated_time=values.get('updated_time'), expires=values.get('expires'))
+        return values
 
-    @property
-    def date_expires(self) -> date:
-        # Extract the number of days from the expires string
-        days_left = int(self.expires.split()[2])
+    @root_validator(skip_on_failure=True)
+    def render_description(cls, values):
+        if values.get('description_html') is None:
+            values['description_html'] = format_description(description=values.get('description'))
+        return values
 
-        # Calculate the expiration date based on the posted date
-        expiration_date = self.posted_date + timedelta(days=days_left)
-        return expiration_date
+    @property
+    def date_expires(self) -> date | None:
+        # older name of expiration_date
+        return self.expiration_date
 
     def disp_dict(self) -> dict[str, str | date]:
         """
@@ -58,8 +67,6 @@ class Job(BaseModel):
 
         :return: A dictionary containing various attributes of the Job.
         """
-        expiration_date = self.date_expires
-
         # Create the dictionary and return
         return {
             "job_id": self.job_id,
@@ -69,6 +76,9 @@ class Job(BaseModel):
             "title": self.title,
             "company_name": self.company_name,
             "salary": self.salary,
+            "salary_min": self.salary_min,
+            "salary_max": self.salary_max,
+            "salary_period": self.salary_period,
             "position": self.position,
             "location": self.location,
             "updated_time": self.updated_time,
@@ -77,5 +87,5 @@ class Job(BaseModel):
             "job_ref": self.job_ref,
             "description": self.description,
             "desired_skills": self.desired_skills,
-            "expiration_date": expiration_date  # Add the calculated expiration date
+            "expiration_date": self.expiration_date
         }
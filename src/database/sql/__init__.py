@@ -1,14 +1,42 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import scoped_session, sessionmaker
 
 from src.config import config_instance
+from src.database.sql.pool import MeteredQueuePool
+
+config = config_instance()
+settings = config.MYSQL_SETTINGS
+
+
+def engine_options(url: str) -> dict:
+    """
+        pool configuration for the database at url, in memory sqlite databases live in a single connection
+        and keep the default pool
+    :param url:
+    :return:
+    """
+    database_url = make_url(url)
+    if database_url.get_backend_name() == "sqlite" and database_url.database in (None, "", ":memory:"):
+        return {}
+    return dict(poolclass=MeteredQueuePool, pool_size=config.DB_POOL_SIZE, max_overflow=config.DB_MAX_OVERFLOW,
+                pool_timeout=config.DB_POOL_TIMEOUT, pool_recycle=config.DB_POOL_RECYCLE, pool_pre_ping=True)
+
 
-settings = config_instance().MYSQL_SETTINGS
 # Replace 'your_username', 'your_password', 'your_host', and 'your_database' with your MySQL database credentials
-engine = create_engine(settings.DEVELOPMENT_DB)
+engine = create_engine(settings.DEVELOPMENT_DB, **engine_options(settings.DEVELOPMENT_DB))
 Session = sessionmaker(bind=engine)
-session = Session()
+# one session per request or thread, removed when the request ends so its connection goes back to the pool
+scoped_sessions = scoped_session(Session)
+
+
+def remove_session(exception=None):
+    scoped_sessions.remove()
+
+
+def pool_status() -> dict[str, int | float] | None:
+    return engine.pool.metrics() if isinstance(engine.pool, MeteredQueuePool) else None
 
 
 Base = declarative_base()
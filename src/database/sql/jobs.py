@@ -1,6 +1,7 @@
+import json
 import uuid
 from datetime import date
-from sqlalchemy import Column, String, Date, Text, inspect
+from sqlalchemy import Column, String, Date, Text, Float, inspect, text
 
 from src.database.constants import NAME_LEN, ID_LEN
 from src.database.sql import Base, engine
@@ -16,6 +17,10 @@ class JobsORM(Base):
     title = Column(Text)
     company_name = Column(String(NAME_LEN))
     salary = Column(String(NAME_LEN))
+    # double precision, a plain Float is single precision FLOAT on MySQL and rounds salaries
+    salary_min = Column(Float(precision=53), nullable=True, index=True)
+    salary_max = Column(Float(precision=53), nullable=True)
+    salary_period = Column(String(16), nullable=True)
     position = Column(String(NAME_LEN))
     location = Column(String(NAME_LEN))
     posted_date = Column(Date)
@@ -30,26 +35,44 @@ class JobsORM(Base):
     def create_if_not_table(cls):
         if not inspect(engine).has_table(cls.__tablename__):
             Base.metadata.create_all(bind=engine)
+        else:
+            cls.add_missing_columns()
+
+    @classmethod
+    def add_missing_columns(cls):
+        """
+            adds columns introduced after the table was created, existing rows get NULL
+        :return:
+        """
+        existing = {column['name'] for column in inspect(engine).get_columns(cls.__tablename__)}
+        with engine.begin() as connection:
+            for column in cls.__table__.columns:
+                if column.name not in existing:
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    connection.execute(text(f"ALTER TABLE {cls.__tablename__} ADD COLUMN {column.name} {column_type}"))
 
     def __init__(self, **kwargs):
         # Initialize the ORM instance based on the Pydantic model
         super().__init__(
-            job_id=kwargs.get('job_id', str(uuid.uuid4())),
+            job_id=kwargs.get('job_id', uuid.uuid4().hex),
             search_term=kwargs['search_term'],
             logo_link=kwargs['logo_link'],
             job_link=kwargs['job_link'],
             title=kwargs['title'],
             company_name=kwargs['company_name'],
             salary=kwargs['salary'],
+            salary_min=kwargs.get('salary_min'),
+            salary_max=kwargs.get('salary_max'),
+            salary_period=kwargs.get('salary_period'),
             position=kwargs['position'],
             location=kwargs['location'],
-            posted_date=kwargs['posted_date'],
+            posted_date=kwargs.get('posted_date'),
             updated_time=kwargs['updated_time'],
             expires=kwargs['expires'],
             job_ref=kwargs['job_ref'],
             description=kwargs['description'],
             desired_skills=kwargs['desired_skills'],
-            expiration_date=self.date_expires
+            expiration_date=kwargs.get('expiration_date')
         )
 
     def to_dict(self) -> dict[str, str | date]:
@@ -66,6 +89,9 @@ class JobsORM(Base):
             "title": self.title,
             "company_name": self.company_name,
             "salary": self.salary,
+            "salary_min": self.salary_min,
+            "salary_max": self.salary_max,
+            "salary_period": self.salary_period,
             "position": self.position,
             "location": self.location,
             "posted_date": self.posted_date,
@@ -73,6 +99,6 @@ class JobsORM(Base):
             "expires": self.expires,
             "job_ref": self.job_ref,
             "description": self.description,
-            "desired_skills": self.desired_skills,
-            "expiration_date": self.date_expires,
+            "desired_skills": json.loads(self.desired_skills) if self.desired_skills else None,
+            "expiration_date": self.expiration_date,
         }
@@ -0,0 +1,49 @@
+import threading
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+class MeteredQueuePool(QueuePool):
+    """
+    **MeteredQueuePool**
+        QueuePool which counts how connections are handed out, checkouts which had to wait for a connection
+        show the pool is too small for the load before requests start timing out
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._metrics_lock = threading.Lock()
+        self.waiting: int = 0
+        self.max_waiting: int = 0
+        self.checkouts: int = 0
+        self.timeouts: int = 0
+        self.wait_seconds: float = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        # every connection in the pool and in overflow is taken, this checkout blocks until one is returned
+        exhausted = self.checkedout() >= self.size() + self._max_overflow
+        if exhausted:
+            with self._metrics_lock:
+                self.waiting += 1
+                self.max_waiting = max(self.max_waiting, self.waiting)
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            with self._metrics_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            with self._metrics_lock:
+                if exhausted:
+                    self.waiting -= 1
+                self.checkouts += 1
+                self.wait_seconds += time.perf_counter() - started
+
+    def metrics(self) -> dict[str, int | float]:
+        return dict(size=self.size(), max_overflow=self._max_overflow, checked_out=self.checkedout(),
+                    checked_in=self.checkedin(), overflow=max(self.overflow(), 0), waiting=self.waiting,
+                    max_waiting=self.max_waiting, checkouts=self.checkouts, timeouts=self.timeouts,
+                    wait_seconds=round(self.wait_seconds, 3))
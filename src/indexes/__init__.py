@@ -0,0 +1,5 @@
+from src.indexes.category import CategoryIndex
+from src.indexes.facets import FacetIndex, FACET_FIELDS
+from src.indexes.fulltext import SearchIndex
+from src.indexes.salary import SalaryIndex
+from src.indexes.expiry import ExpiryIndex
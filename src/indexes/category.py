@@ -0,0 +1,46 @@
+class CategoryIndex:
+    """
+    **CategoryIndex**
+        secondary index from the normalized search term to the ordered job references in that category,
+        category pages read it directly instead of scanning every stored job
+    """
+
+    def __init__(self):
+        # dicts keep insertion order and give O(1) removal which makes them ordered sets
+        self._categories: dict[str, dict[str, None]] = {}
+        self._job_categories: dict[str, str] = {}
+
+    @staticmethod
+    def normalize(search_term: str) -> str:
+        return search_term.casefold()
+
+    def add(self, ref: str, search_term: str):
+        category = self.normalize(search_term)
+        current = self._job_categories.get(ref)
+        if current == category:
+            return
+        if current is not None:
+            self.remove(ref=ref)
+        self._categories.setdefault(category, {})[ref] = None
+        self._job_categories[ref] = category
+
+    def remove(self, ref: str):
+        category = self._job_categories.pop(ref, None)
+        if category is None:
+            return
+        refs = self._categories[category]
+        refs.pop(ref, None)
+        if not refs:
+            del self._categories[category]
+
+    def refs(self, search_term: str) -> list[str]:
+        return list(self._categories.get(self.normalize(search_term), ()))
+
+    def count(self, search_term: str) -> int:
+        return len(self._categories.get(self.normalize(search_term), ()))
+
+    def category(self, ref: str) -> str | None:
+        return self._job_categories.get(ref)
+
+    def __len__(self):
+        return len(self._job_categories)
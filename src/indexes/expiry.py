@@ -0,0 +1,87 @@
+import heapq
+from datetime import date
+
+
+class ExpiryIndex:
+    """
+    **ExpiryIndex**
+        min-heap of job references keyed on their expiration date, the jobs which lapsed are popped off
+        the top so a sweep costs O(k log n) for k expired jobs no matter how many jobs are stored
+
+        updates and removals leave stale heap entries behind which are skipped when popped, the heap is
+        rebuilt once stale entries outnumber live ones
+    """
+
+    def __init__(self):
+        self._heap: list[tuple[int, int, str]] = []
+        self._expires: dict[str, int] = {}
+        self._sequence: int = 0
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+    def __contains__(self, ref: str) -> bool:
+        return ref in self._expires
+
+    @staticmethod
+    def expiration_date(job) -> date | None:
+        """
+            expiration date of a job, parsed at ingest and None when it could not be worked out from the
+            scraped fields
+        :param job:
+        :return:
+        """
+        return getattr(job, "expiration_date", None)
+
+    def add(self, ref: str, job):
+        expires = self.expiration_date(job)
+        if expires is None:
+            self.remove(ref=ref)
+            return
+        ordinal = expires.toordinal()
+        if self._expires.get(ref) == ordinal:
+            return
+        self._expires[ref] = ordinal
+        self._sequence += 1
+        heapq.heappush(self._heap, (ordinal, self._sequence, ref))
+        self._compact()
+
+    def remove(self, ref: str):
+        if self._expires.pop(ref, None) is not None:
+            self._compact()
+
+    def _compact(self):
+        if len(self._heap) > 64 and len(self._heap) > 2 * len(self._expires):
+            self._heap = [entry for entry in self._heap if self._expires.get(entry[2]) == entry[0]]
+            heapq.heapify(self._heap)
+
+    def sort(self, refs: list[str], reverse: bool = False) -> list[str]:
+        """
+            orders refs by expiration date, jobs without one are kept last in their original order
+        :param refs:
+        :param reverse: latest expiration first
+        :return:
+        """
+        expires = self._expires
+        with_expiry = sorted((ref for ref in refs if ref in expires), key=expires.__getitem__, reverse=reverse)
+        return with_expiry + [ref for ref in refs if ref not in expires]
+
+    def next_expiry(self) -> date | None:
+        while self._heap and self._expires.get(self._heap[0][2]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return date.fromordinal(self._heap[0][0]) if self._heap else None
+
+    def expired(self, today: date | None = None) -> list[str]:
+        """
+            pops every job which expired before today
+        :param today: defaults to the current date
+        :return: references of the expired jobs, they are no longer tracked
+        """
+        limit = (today or date.today()).toordinal()
+        refs = []
+        while self._heap and self._heap[0][0] < limit:
+            ordinal, _, ref = heapq.heappop(self._heap)
+            if self._expires.get(ref) == ordinal:
+                del self._expires[ref]
+                refs.append(ref)
+        return refs
@@ -0,0 +1,102 @@
+from collections import Counter
+
+FACET_FIELDS: tuple[str, ...] = ("search_term", "position", "location", "company_name")
+
+
+class FacetIndex:
+    """
+    **FacetIndex**
+        posting lists from each facet value to job references, kept next to the job store
+
+        counts for every facet are maintained incrementally, both across all jobs and per category,
+        so rendering facet counts never rescans the catalog
+    """
+
+    def __init__(self, fields: tuple[str, ...] = FACET_FIELDS):
+        self.fields = fields
+        # field -> normalized value -> ordered set of references
+        self._postings: dict[str, dict[str, dict[str, None]]] = {field: {} for field in fields}
+        # field -> normalized value -> value as first seen, used for display
+        self._labels: dict[str, dict[str, str]] = {field: {} for field in fields}
+        self._job_values: dict[str, tuple[str, ...]] = {}
+        # category -> field -> counts of normalized values
+        self._category_counts: dict[str, dict[str, Counter]] = {}
+
+    @staticmethod
+    def normalize(value: str | None) -> str:
+        return " ".join((value or "N/A").split()).casefold()
+
+    def add(self, ref: str, job):
+        if ref in self._job_values:
+            self.remove(ref=ref)
+        values = []
+        for field in self.fields:
+            label = " ".join((getattr(job, field, None) or "N/A").split())
+            value = label.casefold()
+            self._postings[field].setdefault(value, {})[ref] = None
+            self._labels[field].setdefault(value, label)
+            values.append(value)
+        self._job_values[ref] = tuple(values)
+
+        category_counts = self._category_counts.setdefault(values[0], {field: Counter() for field in self.fields})
+        for field, value in zip(self.fields, values):
+            category_counts[field][value] += 1
+
+    def remove(self, ref: str):
+        values = self._job_values.pop(ref, None)
+        if values is None:
+            return
+        category_counts = self._category_counts[values[0]]
+        for field, value in zip(self.fields, values):
+            postings = self._postings[field][value]
+            postings.pop(ref, None)
+            if not postings:
+                del self._postings[field][value]
+            category_counts[field][value] -= 1
+            if category_counts[field][value] <= 0:
+                del category_counts[field][value]
+        if not category_counts[self.fields[0]]:
+            del self._category_counts[values[0]]
+
+    def refs(self, field: str, value: str) -> dict[str, None]:
+        return self._postings[field].get(self.normalize(value), {})
+
+    def label(self, field: str, value: str) -> str:
+        return self._labels[field].get(value, value)
+
+    def filter(self, refs: list[str], filters: dict[str, str]) -> list[str]:
+        """
+            keeps the references matching every filter, order of refs is preserved
+        :param refs: base result e.g. a category listing
+        :param filters: facet field -> value
+        :return:
+        """
+        postings = sorted((self.refs(field=field, value=value) for field, value in filters.items()), key=len)
+        if not postings:
+            return refs
+        return [ref for ref in refs if all(ref in posting for posting in postings)]
+
+    def counts(self, category: str | None = None, refs: list[str] | None = None, limit: int = 10,
+               fields: tuple[str, ...] | None = None) -> dict[str, list[tuple[str, str, int]]]:
+        """
+            facet counts, precomputed for a whole category or computed over an already filtered result
+        :param category: normalized search term, None for all jobs
+        :param refs: filtered references, takes precedence over category
+        :param limit: maximum number of values per facet
+        :param fields: facets to count, defaults to all
+        :return: field -> [(value, label, count)] most common first
+        """
+        fields = fields or self.fields
+        if refs is not None:
+            counters = {field: Counter() for field in self.fields}
+            for ref in refs:
+                for field, value in zip(self.fields, self._job_values.get(ref, ())):
+                    counters[field][value] += 1
+        elif category is not None:
+            counters = self._category_counts.get(category, {field: Counter() for field in self.fields})
+        else:
+            counters = {field: Counter({value: len(postings) for value, postings in self._postings[field].items()})
+                        for field in fields}
+
+        return {field: [(value, self.label(field, value), count)
+                        for value, count in counters[field].most_common(limit)] for field in fields}
@@ -0,0 +1,142 @@
+import heapq
+import math
+import re
+from collections import Counter
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+STOP_WORDS: frozenset[str] = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our the their this to we will with you your"
+    .split())
+
+# title and skill matches count for more than a mention somewhere in the description
+FIELD_WEIGHTS: dict[str, float] = {"title": 3.0, "company_name": 2.0, "desired_skills": 2.0, "description": 1.0}
+
+
+def tokenize(text: str) -> list[str]:
+    return [token for token in TOKEN_PATTERN.findall(text.casefold()) if token not in STOP_WORDS]
+
+
+class SearchIndex:
+    """
+    **SearchIndex**
+        in-memory inverted index over job titles, company names, descriptions and desired skills,
+        results are ranked with BM25 using field weighted term frequencies
+
+        terms found in more than champion_size documents are searched through a champion list, their
+        champion_size highest impact postings, which keeps query time flat as the catalog grows
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, champion_size: int = 500):
+        self.k1 = k1
+        self.b = b
+        self.champion_size = champion_size
+        self._postings: dict[str, dict[int, float]] = {}
+        # rebuilt lazily on the first query after the term's postings change
+        self._champions: dict[str, list[int]] = {}
+        self._doc_ids: dict[str, int] = {}
+        self._refs: dict[int, str] = {}
+        self._doc_terms: dict[int, tuple[str, ...]] = {}
+        self._doc_lengths: dict[int, float] = {}
+        self._total_length: float = 0.0
+        self._next_id: int = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_ids)
+
+    def __contains__(self, ref: str) -> bool:
+        return ref in self._doc_ids
+
+    @staticmethod
+    def weighted_terms(job) -> Counter:
+        terms: Counter = Counter()
+        for field, weight in FIELD_WEIGHTS.items():
+            value = getattr(job, field, None)
+            if not value:
+                continue
+            text = " ".join(value) if isinstance(value, (list, tuple)) else value
+            for token in tokenize(text):
+                terms[token] += weight
+        return terms
+
+    def add(self, ref: str, job):
+        """
+            index a job, re-adding an indexed reference replaces its previous entry
+        :param ref: formatted job reference
+        :param job:
+        :return:
+        """
+        if ref in self._doc_ids:
+            self.remove(ref=ref)
+        doc_id = self._next_id
+        self._next_id += 1
+
+        terms = self.weighted_terms(job)
+        for token, frequency in terms.items():
+            self._postings.setdefault(token, {})[doc_id] = frequency
+            self._champions.pop(token, None)
+        length = sum(terms.values())
+        self._doc_ids[ref] = doc_id
+        self._refs[doc_id] = ref
+        self._doc_terms[doc_id] = tuple(terms)
+        self._doc_lengths[doc_id] = length
+        self._total_length += length
+
+    def remove(self, ref: str):
+        doc_id = self._doc_ids.pop(ref, None)
+        if doc_id is None:
+            return
+        del self._refs[doc_id]
+        for token in self._doc_terms.pop(doc_id):
+            postings = self._postings[token]
+            del postings[doc_id]
+            self._champions.pop(token, None)
+            if not postings:
+                del self._postings[token]
+        self._total_length -= self._doc_lengths.pop(doc_id)
+
+    def _norm(self, doc_id: int, average_length: float) -> float:
+        return self.k1 * (1 - self.b + self.b * self._doc_lengths[doc_id] / average_length)
+
+    def champions(self, token: str, average_length: float) -> list[int]:
+        champions = self._champions.get(token)
+        if champions is None:
+            postings = self._postings[token]
+            top = heapq.nlargest(self.champion_size, postings.items(),
+                                 key=lambda item: item[1] / (item[1] + self._norm(item[0], average_length)))
+            champions = self._champions[token] = [doc_id for doc_id, _ in top]
+        return champions
+
+    def search(self, query: str, k: int = 20) -> list[tuple[str, float]]:
+        """
+            top k references for the query ranked by BM25
+        :param query:
+        :param k:
+        :return: (reference, score) pairs, best match first
+        """
+        total_docs = len(self._doc_ids)
+        if not total_docs:
+            return []
+        average_length = self._total_length / total_docs or 1.0
+
+        tokens = [token for token in set(tokenize(query)) if token in self._postings]
+        candidates: set[int] = set()
+        for token in tokens:
+            postings = self._postings[token]
+            if len(postings) > self.champion_size:
+                candidates.update(self.champions(token=token, average_length=average_length))
+            else:
+                candidates.update(postings)
+
+        k1 = self.k1
+        norms: dict[int, float] = {doc_id: self._norm(doc_id, average_length) for doc_id in candidates}
+        scores: dict[int, float] = dict.fromkeys(candidates, 0.0)
+        for token in tokens:
+            postings = self._postings[token]
+            document_frequency = len(postings)
+            idf = math.log(1 + (total_docs - document_frequency + 0.5) / (document_frequency + 0.5))
+            for doc_id in postings.keys() & candidates:
+                frequency = postings[doc_id]
+                scores[doc_id] += idf * frequency * (k1 + 1) / (frequency + norms[doc_id])
+
+        top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [(self._refs[doc_id], score) for doc_id, score in top]
@@ -0,0 +1,104 @@
+from array import array
+from bisect import bisect_left, bisect_right
+
+
+class SalaryIndex:
+    """
+    **SalaryIndex**
+        job references sorted by normalized monthly salary so filtering by salary never parses salary
+        strings at query time
+
+        jobs without a parsed salary are not indexed, references are kept sorted twice, on the minimum and on
+        the maximum of each job's range, a job overlaps [low, high] when its minimum is at most high and its
+        maximum at least low, each bound is a binary search and only the smaller side is scanned
+    """
+
+    def __init__(self):
+        self._keys = array("d")
+        self._refs: list[str] = []
+        self._max_keys = array("d")
+        self._max_refs: list[str] = []
+        self._ranges: dict[str, tuple[float, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._refs)
+
+    def __contains__(self, ref: str) -> bool:
+        return ref in self._ranges
+
+    @staticmethod
+    def _insert(keys: array, refs: list[str], key: float, ref: str):
+        position = bisect_right(keys, key)
+        keys.insert(position, key)
+        refs.insert(position, ref)
+
+    @staticmethod
+    def _delete(keys: array, refs: list[str], key: float, ref: str):
+        start = bisect_left(keys, key)
+        position = refs.index(ref, start, bisect_right(keys, key, lo=start))
+        del keys[position]
+        del refs[position]
+
+    def add(self, ref: str, job):
+        if ref in self._ranges:
+            self.remove(ref=ref)
+        salary_min = getattr(job, "salary_min", None)
+        if salary_min is None:
+            return
+        salary_max = getattr(job, "salary_max", None) or salary_min
+        self._insert(self._keys, self._refs, salary_min, ref)
+        self._insert(self._max_keys, self._max_refs, salary_max, ref)
+        self._ranges[ref] = (salary_min, salary_max)
+
+    def remove(self, ref: str):
+        salary_range = self._ranges.pop(ref, None)
+        if salary_range is None:
+            return
+        self._delete(self._keys, self._refs, salary_range[0], ref)
+        self._delete(self._max_keys, self._max_refs, salary_range[1], ref)
+
+    def overlaps(self, ref: str, low: float | None = None, high: float | None = None) -> bool:
+        salary_range = self._ranges.get(ref)
+        if salary_range is None:
+            return False
+        return (high is None or salary_range[0] <= high) and (low is None or salary_range[1] >= low)
+
+    def range(self, low: float | None = None, high: float | None = None) -> list[str]:
+        """
+            references of jobs whose salary range overlaps [low, high], lowest salary first
+        :param low: minimum monthly amount, None for no lower bound
+        :param high: maximum monthly amount, None for no upper bound
+        :return:
+        """
+        # jobs with a minimum up to high are a prefix of one array, jobs with a maximum from low a suffix of the other
+        end = len(self._keys) if high is None else bisect_right(self._keys, high)
+        start = 0 if low is None else bisect_left(self._max_keys, low)
+        if low is None:
+            return self._refs[:end]
+        ranges = self._ranges
+        if high is None or len(self._max_refs) - start < end:
+            refs = [ref for ref in self._max_refs[start:] if high is None or ranges[ref][0] <= high]
+            return sorted(refs, key=ranges.__getitem__)
+        return [ref for ref in self._refs[:end] if ranges[ref][1] >= low]
+
+    def filter(self, refs: list[str], low: float | None = None, high: float | None = None) -> list[str]:
+        """
+            narrows refs which are already small e.g. one category down to the jobs overlapping [low, high],
+            costs one lookup per ref whatever the size of the index
+        :param refs:
+        :param low: minimum monthly amount, None for no lower bound
+        :param high: maximum monthly amount, None for no upper bound
+        :return: matching refs in their original order
+        """
+        return [ref for ref in refs if self.overlaps(ref=ref, low=low, high=high)]
+
+    def sort(self, refs: list[str], reverse: bool = False) -> list[str]:
+        """
+            orders refs by salary, jobs without a salary are kept last in their original order
+        :param refs:
+        :param reverse: highest salary first
+        :return:
+        """
+        ranges = self._ranges
+        with_salary = sorted((ref for ref in refs if ref in ranges), key=lambda ref: ranges[ref], reverse=reverse)
+        return with_salary + [ref for ref in refs if ref not in ranges]
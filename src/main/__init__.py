@@ -1,7 +1,10 @@
 from flask import Flask
-from src.scrappers import JunctionScrapper, CareerScrapper, Scrapper
+from src.scrappers import JunctionScrapper, CareerScrapper, Scrapper, CrawlScheduler
+from src.scrappers.leader import CrawlLock
+from src.scrappers.refresh import RefreshScheduler
 from src.utils import template_folder, static_folder, format_title, format_description, bootstrap_database
 from src.controllers import StorageController
+from src.database.sql import remove_session
 
 bootstrap_database()
 
@@ -10,6 +13,9 @@ storage_controller = StorageController()
 scrapper = Scrapper()
 junction_scrapper = JunctionScrapper(scrapper=scrapper)
 career_scrapper = CareerScrapper(scrapper=scrapper)
+# all sources and search terms are crawled concurrently, add career_scrapper here to enable careers24
+crawl_scheduler = CrawlScheduler(scrapper=scrapper, sources=[junction_scrapper])
+refresh_scheduler = RefreshScheduler(crawl_scheduler=crawl_scheduler)
 
 
 def create_app(config):
@@ -23,20 +29,32 @@ def create_app(config):
     app.static_folder = static_folder()
     app.config['SECRET_KEY'] = config.SECRET_KEY
     app.config['BASE_URL'] = "https://jobfinders.site"
+    app.teardown_appcontext(remove_session)
 
     with app.app_context():
         # initialization
         # storage_controller.init_app(app=app)
-        junction_scrapper.init_app(app=app)
+        scrapper.load_snapshot()
+        seed = storage_controller.stream_jobs_from_database if config.SEED_FROM_DATABASE else None
+        store = storage_controller.store_jobs_to_database if config.STORE_TO_DATABASE else None
+        lock = CrawlLock(path=config.CRAWL_LOCK_PATH) if config.CRAWL_LOCK_PATH else None
+        crawl_scheduler.init_app(app=app, background=config.STARTUP_MODE == "background", seed=seed, lock=lock,
+                                 follow_interval=config.FOLLOW_INTERVAL, store=store)
+        refresh_scheduler.init_app(app=app, enabled=config.REFRESH_ENABLED, min_interval=config.REFRESH_MIN_INTERVAL,
+                                   max_interval=config.REFRESH_MAX_INTERVAL)
         # career_scrapper.init_app(app=app)
 
         # importing routes
         from src.routes.home import home_route
         from src.routes.seo import seo_route
+        from src.routes.health import health_route
+        from src.routes.cron import cron_route
 
         # registering routes
         app.register_blueprint(home_route)
         app.register_blueprint(seo_route)
+        app.register_blueprint(health_route)
+        app.register_blueprint(cron_route)
 
         # registering filters
         app.jinja_env.filters['title'] = format_title
@@ -0,0 +1,289 @@
+import re
+import uuid
+
+from bs4 import BeautifulSoup
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    HTMLParser = None
+
+# parsers run inside the ParserPool worker processes, keep this module free of src imports so a worker unpickling
+# them does not import the scrappers package along with its caches, indexes and http client
+
+# backends understood by the parsers below, html.parser and lxml run through BeautifulSoup
+# while selectolax is a much faster css selector based parser
+PARSER_BACKENDS: tuple[str, ...] = ("html.parser", "lxml", "selectolax")
+
+
+def parse_posted_date(date_line: str) -> tuple[str, str]:
+    """
+        splits the careers24 date list item into its posted and expiry lines, the dates in them are
+        parsed by parse_job_dates
+    :param date_line: e.g. "Posted 3 days ago<br>Closing Date: 30/10/2024"
+    :return: updated_time, expires, "N/A" for a line which is missing
+    """
+    separators = ["\n61", "<br\\>", "<br>"]
+
+    for separator in separators:
+        if separator in date_line:
+            parts = date_line.split(separator)
+            if len(parts) == 2:
+                return parts[0].strip(), parts[1].strip()
+
+    # the separator differs between listing layouts, any line break will do
+    lines = [line.strip() for line in re.split(r"<br\s*\\?/?>|\n", date_line) if line.strip()]
+    if len(lines) >= 2:
+        return lines[0], lines[1]
+    if len(lines) == 1:
+        return lines[0], "N/A"
+    return "N/A", "N/A"
+
+
+def extra_data_(extra_data: list[str], posted_date_line: str) -> tuple[str, str, str, str]:
+    """
+        :param extra_data: stripped text of the list items on a careers24 job card
+        :param posted_date_line: unstripped text of the third list item
+        :return: expires, job_type, location, updated_time
+    """
+    if len(extra_data) >= 3:
+        location = extra_data[0]
+        job_type = extra_data[1].split(":")[1]
+        updated_time, expires = parse_posted_date(date_line=posted_date_line.strip())
+    else:
+        location = "N/A"
+        job_type = "N/A"
+        updated_time = "N/A"
+        expires = "N/A"
+    return expires, job_type, location, updated_time
+
+
+def _format_job_ref(job_ref: str) -> str:
+    if not job_ref:
+        job_ref = str(uuid.uuid4())
+    if "/" in job_ref:
+        job_ref = job_ref.split("/")[0]
+    return job_ref
+
+
+def _text_or_default(text: str | None, default: str = "N/A") -> str:
+    return text.strip() if text is not None else default
+
+
+# Career Junction
+
+def _junction_listing_soup(content: bytes, base_url: str, backend: str) -> list[str]:
+    soup = BeautifulSoup(content, backend)
+    links = []
+    for job_element in soup.find_all("div", class_="job-result"):
+        show_more_link: str = job_element.find("a", class_="show-more")["href"]
+        links.append(f"{base_url}{show_more_link.replace('/', '')}")
+    return links
+
+
+def _junction_listing_selectolax(content: bytes, base_url: str, backend: str) -> list[str]:
+    tree = HTMLParser(content)
+    links = []
+    for job_element in tree.css("div.job-result"):
+        show_more_link: str = job_element.css_first("a.show-more").attributes["href"]
+        links.append(f"{base_url}{show_more_link.replace('/', '')}")
+    return links
+
+
+def _junction_detail_soup(content: bytes, job_link: str, search_term: str, backend: str) -> dict | None:
+    job_soup = BeautifulSoup(content, backend)
+    try:
+        job_element = job_soup.find("div", class_="job-description")
+
+        job_dict = {"search_term": search_term,
+                    "logo_link": job_element.find("img")["src"],
+                    "title": job_element.find("h1").text.strip(),
+                    "job_link": job_link,
+                    "company_name": job_element.find("h2").text.strip(),
+                    "salary": job_element.find("li", class_="salary").text.strip(),
+                    "position": job_element.find("li", class_="position").text.strip(),
+                    "location": job_element.find("li", class_="location").text.strip(),
+                    "updated_time": job_element.find("li", class_="updated-time").text.strip(),
+                    "expires": job_element.find("li", class_="expires").text.strip(),
+                    "job_ref": job_element.find("li", class_="cjun-job-ref").text.strip()}
+
+        description_element = job_soup.find("div", class_="job-desc-on-expired")
+        job_description = description_element.find("div", class_="job-details").text.strip()
+
+        # Extract the desired skills
+        try:
+            desired_skills_element = description_element.find_all("ul")[0]
+            desired_skills = [skill.text.strip() for skill in desired_skills_element.find_all("li") if skill]
+
+        except IndexError:
+            desired_skills = []
+
+        job_dict['description'] = job_description
+        job_dict['desired_skills'] = desired_skills
+
+        return job_dict
+    except (AttributeError, TypeError):
+        return None
+
+
+def _junction_detail_selectolax(content: bytes, job_link: str, search_term: str, backend: str) -> dict | None:
+    tree = HTMLParser(content)
+    try:
+        job_element = tree.css_first("div.job-description")
+
+        job_dict = {"search_term": search_term,
+                    "logo_link": job_element.css_first("img").attributes["src"],
+                    "title": job_element.css_first("h1").text().strip(),
+                    "job_link": job_link,
+                    "company_name": job_element.css_first("h2").text().strip(),
+                    "salary": job_element.css_first("li.salary").text().strip(),
+                    "position": job_element.css_first("li.position").text().strip(),
+                    "location": job_element.css_first("li.location").text().strip(),
+                    "updated_time": job_element.css_first("li.updated-time").text().strip(),
+                    "expires": job_element.css_first("li.expires").text().strip(),
+                    "job_ref": job_element.css_first("li.cjun-job-ref").text().strip()}
+
+        description_element = tree.css_first("div.job-desc-on-expired")
+        job_description = description_element.css_first("div.job-details").text().strip()
+
+        desired_skills_element = description_element.css_first("ul")
+        if desired_skills_element is not None:
+            desired_skills = [skill.text().strip() for skill in desired_skills_element.css("li")]
+        else:
+            desired_skills = []
+
+        job_dict['description'] = job_description
+        job_dict['desired_skills'] = desired_skills
+
+        return job_dict
+    except (AttributeError, KeyError):
+        return None
+
+
+# Careers24
+
+def _career_listing_soup(content: bytes, search_term: str, backend: str) -> list[dict]:
+    soup = BeautifulSoup(content, backend)
+    listings = []
+    for job in soup.find_all("div", class_="job-card"):
+        title = job.find("h2").text.strip()
+        image_tag = job.find("img")
+
+        if image_tag:
+            company_name = image_tag["alt"]
+            logo_link = image_tag["src"]
+        else:
+            company_name = None
+            logo_link = None
+
+        list_items = job.find_all("li")
+        posted_date_line = list_items[2].get_text(strip=False) if len(list_items) >= 3 else ""
+        expires, job_type, location, updated_time = extra_data_(
+            extra_data=[item.get_text(strip=True) for item in list_items], posted_date_line=posted_date_line)
+        link_tag = job.find("i")
+        if link_tag is None or not link_tag.has_attr("data-url"):
+            continue
+
+        listings.append(dict(search_term=search_term, title=title, logo_link=logo_link,
+                             job_link=link_tag["data-url"], company_name=company_name, position=job_type,
+                             location=location, updated_time=updated_time, expires=expires))
+    return listings
+
+
+def _career_listing_selectolax(content: bytes, search_term: str, backend: str) -> list[dict]:
+    tree = HTMLParser(content)
+    listings = []
+    for job in tree.css("div.job-card"):
+        title = job.css_first("h2").text().strip()
+        image_tag = job.css_first("img")
+
+        if image_tag is not None:
+            company_name = image_tag.attributes.get("alt")
+            logo_link = image_tag.attributes.get("src")
+        else:
+            company_name = None
+            logo_link = None
+
+        list_items = job.css("li")
+        posted_date_line = list_items[2].text(strip=False) if len(list_items) >= 3 else ""
+        expires, job_type, location, updated_time = extra_data_(
+            extra_data=[item.text(strip=True) for item in list_items], posted_date_line=posted_date_line)
+        link_tag = job.css_first("i")
+        if link_tag is None or "data-url" not in link_tag.attributes:
+            continue
+
+        listings.append(dict(search_term=search_term, title=title, logo_link=logo_link,
+                             job_link=link_tag.attributes["data-url"], company_name=company_name,
+                             position=job_type, location=location, updated_time=updated_time, expires=expires))
+    return listings
+
+
+def _career_detail_soup(content: bytes, company_name: str | None, backend: str) -> tuple:
+    try:
+        job_details_soup = BeautifulSoup(content, backend)
+        vacancy_details = job_details_soup.find("div", class_="c24-vacancy-deatils-container")
+
+        def find_text_or_default(element, default="N/A"):
+            return element.text.strip() if element else default
+
+        salary_tag = vacancy_details.find("li", string="Salary:")
+        salary = find_text_or_default(salary_tag.find_next("li", class_="elipses")).split(":")[1]
+
+        reference_tags = vacancy_details.find("ul", class_="small-text").find_all("li")
+        job_ref = _format_job_ref(find_text_or_default(reference_tags[-1]))
+
+        description = find_text_or_default(vacancy_details.find("div", class_="v-descrip"))
+        if not company_name:
+            company_name = find_text_or_default(vacancy_details.find("p", class_="mb-15"), default="N/A")
+
+        return company_name, description, job_ref, salary
+    except (AttributeError, IndexError):
+        return None, None, None, None
+
+
+def _career_detail_selectolax(content: bytes, company_name: str | None, backend: str) -> tuple:
+    try:
+        tree = HTMLParser(content)
+        vacancy_details = tree.css_first("div.c24-vacancy-deatils-container")
+
+        # the salary is held by the first "elipses" item following the "Salary:" label
+        list_items = vacancy_details.css("li")
+        label_index = next(index for index, item in enumerate(list_items) if item.text() == "Salary:")
+        salary_tag = next((item for item in list_items[label_index + 1:]
+                           if "elipses" in (item.attributes.get("class") or "").split()), None)
+        salary = _text_or_default(salary_tag.text() if salary_tag else None).split(":")[1]
+
+        reference_tags = vacancy_details.css_first("ul.small-text").css("li")
+        job_ref = _format_job_ref(_text_or_default(reference_tags[-1].text()))
+
+        description_tag = vacancy_details.css_first("div.v-descrip")
+        description = _text_or_default(description_tag.text() if description_tag else None)
+        if not company_name:
+            company_tag = vacancy_details.css_first("p.mb-15")
+            company_name = _text_or_default(company_tag.text() if company_tag else None)
+
+        return company_name, description, job_ref, salary
+    except (AttributeError, IndexError, StopIteration):
+        return None, None, None, None
+
+
+_PARSERS = {
+    "junction_listing": (_junction_listing_soup, _junction_listing_selectolax),
+    "junction_detail": (_junction_detail_soup, _junction_detail_selectolax),
+    "career_listing": (_career_listing_soup, _career_listing_selectolax),
+    "career_detail": (_career_detail_soup, _career_detail_selectolax),
+}
+
+
+def parse(kind: str, backend: str, *args):
+    """
+        entry point executed inside the worker processes, takes raw bytes and returns plain python objects
+    :param kind: one of the keys of _PARSERS
+    :param backend: one of PARSER_BACKENDS
+    :param args: arguments for the parser
+    :return:
+    """
+    soup_parser, selectolax_parser = _PARSERS[kind]
+    if backend == "selectolax":
+        return selectolax_parser(*args, backend)
+    return soup_parser(*args, backend)
@@ -1,20 +1,44 @@
-from flask import Blueprint, render_template, send_from_directory
+import hmac
 
-from src.database.models import Job, SEO
+from flask import Blueprint, jsonify, request
+
+from src.config import config_instance
 from src.logger import init_logger
-from src.main import scrapper
-from src.utils import static_folder, format_title
+from src.main import crawl_scheduler, refresh_scheduler
 
 cron_route = Blueprint('cron', __name__)
 cron_logger = init_logger()
+settings = config_instance()
+
+
+def is_cron_request() -> bool:
+    """
+        True when the request carries the configured cron secret
+    :return:
+    """
+    secret = request.headers.get('X-Cron-Secret', '')
+    return bool(settings.CRON_SECRET) and hmac.compare_digest(secret.encode(), settings.CRON_SECRET.encode())
 
 
 @cron_route.get('/_cron/jobs/')
 async def cron_jobs():
     """
-
+        refresh schedule per search term
     :return:
     """
-    pass
+    return jsonify(dict(crawl=crawl_scheduler.status(), refresh=refresh_scheduler.status()))
 
 
+@cron_route.post('/_cron/jobs/')
+async def cron_refresh():
+    """
+        ?run=<search_term> (repeatable) or ?run=all makes terms due now, every refresh crawls the sources so
+        only callers holding the cron secret may trigger one
+    :return:
+    """
+    if not is_cron_request():
+        return jsonify(dict(error="forbidden")), 403
+    terms = request.args.getlist('run')
+    triggered = refresh_scheduler.trigger(search_terms=None if "all" in terms else terms) if terms else []
+    cron_logger.info(f"Refresh triggered for : {triggered}")
+    return jsonify(dict(crawl=crawl_scheduler.status(), refresh=refresh_scheduler.status(), triggered=triggered))
@@ -0,0 +1,26 @@
+from flask import Blueprint, jsonify
+
+from src.database.sql import pool_status
+from src.main import crawl_scheduler
+
+health_route = Blueprint('health', __name__)
+
+
+@health_route.get('/_health/live')
+async def liveness():
+    """
+        the app answers as soon as the server is up, even while warming up
+    :return:
+    """
+    return jsonify(dict(status="ok"))
+
+
+@health_route.get('/_health/ready')
+async def readiness():
+    """
+        reports warm-up progress and database pool usage, responds with 503 until the first crawl has finished
+    :return:
+    """
+    status = crawl_scheduler.status()
+    status['database'] = pool_status()
+    return jsonify(status), 200 if crawl_scheduler.is_ready else 503
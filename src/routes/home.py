@@ -1,13 +1,35 @@
-from flask import Blueprint, render_template, send_from_directory
+from flask import Blueprint, render_template, send_from_directory, request, redirect, url_for
 
-from src.database.models import Job, SEO
+from src.cache.pages import page_cache
+from src.database.models import SEO
+from src.scrappers.store import CompactJob
+from src.indexes import FACET_FIELDS
 from src.logger import init_logger
-from src.main import scrapper
-from src.utils import static_folder, format_title
+from src.main import scrapper, refresh_scheduler
+from src.utils import static_folder, format_title, format_reference
 
 home_route = Blueprint('home', __name__)
 home_logger = init_logger()
 
+DEFAULT_PER_PAGE: int = 20
+MAX_PER_PAGE: int = 100
+
+
+@home_route.before_request
+def record_traffic():
+    """
+        counts page views per category, busier categories are refreshed more often, this runs before the
+        page cache so cached responses are counted too
+    :return:
+    """
+    if request.endpoint == 'home.get_home':
+        refresh_scheduler.record_hit(search_term="information-technology")
+    elif request.endpoint == 'home.job_search':
+        refresh_scheduler.record_hit(search_term=request.view_args.get('search_term'))
+    elif request.endpoint == 'home.job_detail':
+        ref = format_reference(ref=request.view_args.get('reference', ''))
+        refresh_scheduler.record_hit(search_term=scrapper.category_index.category(ref))
+
 
 async def create_tags(search_term: str) -> SEO:
     """
@@ -23,17 +45,107 @@ async def create_tags(search_term: str) -> SEO:
     return SEO(**seo_dict)
 
 
+def get_filters() -> dict[str, str]:
+    """
+        facet filters from the query string
+    :return:
+    """
+    return {field: request.args[field] for field in FACET_FIELDS if request.args.get(field)}
+
+
+def get_salary_range() -> tuple[float | None, float | None] | None:
+    """
+        monthly salary bounds from the query string
+    :return: None when neither salary_min nor salary_max is given
+    """
+    low = request.args.get('salary_min', type=float)
+    high = request.args.get('salary_max', type=float)
+    if low is None and high is None:
+        return None
+    return low, high
+
+
+def create_facets(counts: dict, filters: dict[str, str], category: str | None = None) -> list[dict]:
+    """
+        facet values with their counts and the links which toggle them
+    :param counts: field -> [(value, label, count)]
+    :param filters: active filters
+    :param category: current category on category pages, other categories are linked by path
+    :return:
+    """
+    facets = []
+    for field in FACET_FIELDS:
+        options = []
+        for value, label, count in counts.get(field, []):
+            if field == "search_term" and category is not None:
+                active = value == category.casefold()
+                url = url_for('home.job_search', search_term=label, **filters)
+            else:
+                active = filters.get(field, '').casefold() == value
+                args = {**request.view_args, **request.args.to_dict()}
+                # a different filter changes the result so start again from the first page
+                args.pop('page', None)
+                if active:
+                    args.pop(field, None)
+                else:
+                    args[field] = label
+                url = url_for(request.endpoint, **args)
+            options.append(dict(label=label, count=count, url=url, active=active))
+        if options:
+            facets.append(dict(field=field, title=format_title(field.replace("_", "-")), options=options))
+    return facets
+
+
+def get_page() -> tuple[int, int]:
+    """
+        page number and page size from the query string, the page size is capped so a request
+        can never render the whole category
+    :return: page, per_page
+    """
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = min(max(request.args.get('per_page', DEFAULT_PER_PAGE, type=int), 1), MAX_PER_PAGE)
+    return page, per_page
+
+
+def create_pagination(page: int, per_page: int, total: int) -> dict:
+    """
+        page position and the previous / next links, other query string arguments are kept
+    :param page:
+    :param per_page:
+    :param total: number of matching jobs
+    :return:
+    """
+    pages = max((total + per_page - 1) // per_page, 1)
+    args = {**request.view_args, **request.args.to_dict()}
+
+    def page_url(number: int) -> str:
+        return url_for(request.endpoint, **{**args, 'page': number})
+
+    return dict(page=page, pages=pages, total=total,
+                previous_url=page_url(page - 1) if page > 1 else None,
+                next_url=page_url(page + 1) if page < pages else None)
+
+
 async def create_context(search_term: str):
     """
         will create common context for jobs
     :param search_term:
-    :return:
+    :return: None for an unknown category or a page past the last one
     """
     if search_term not in scrapper.search_terms:
         # TODO - return an error here preferably with an error page
         return None
 
-    job_list = [job for job in scrapper.jobs.values() if job.search_term.casefold() == search_term.casefold()]
+    filters = {field: value for field, value in get_filters().items() if field != "search_term"}
+    page, per_page = get_page()
+    job_list, counts, total = scrapper.browse(search_term=search_term, filters=filters,
+                                              salary_range=get_salary_range(), sort=request.args.get('sort'),
+                                              page=page, per_page=per_page)
+    pagination = create_pagination(page=page, per_page=per_page, total=total)
+    if page > pagination['pages']:
+        # past the last page, there is nothing to list and no page to link back to
+        return None
+    facets = create_facets(counts=counts, filters=filters, category=search_term)
 
     search_terms: list[str] = scrapper.search_terms
 
@@ -43,7 +155,7 @@ async def create_context(search_term: str):
     next_term: str = search_terms[current_index + 1] if current_index < len(search_terms) - 1 else search_terms[0]
 
     context = dict(term=search_term, previous_term=previous_term, next_term=next_term,
-                   job_list=job_list, search_terms=search_terms, seo=seo)
+                   job_list=job_list, search_terms=search_terms, seo=seo, facets=facets, pagination=pagination)
 
     return render_template('index.html', **context)
 
@@ -52,10 +164,12 @@ async def not_found(search_term: str):
     error_message = f"Unable to retrieve job listings for :  {search_term}"
     status = "404 Not Found"
     error = dict(message=error_message, title=status)
-    return render_template('error.html', error=error), 404
+    seo = await create_tags(search_term=search_term)
+    return render_template('error.html', error=error, seo=seo), 404
 
 
 @home_route.get('/')
+@page_cache.cached(generation=lambda: scrapper.category_generation(search_term="information-technology"))
 async def get_home():
     """
         home directory will start with information tech jobs
@@ -70,6 +184,7 @@ async def get_home():
 
 
 @home_route.get('/jobs/<string:search_term>')
+@page_cache.cached(generation=scrapper.category_generation)
 async def job_search(search_term: str):
     response = await create_context(search_term)
     if response is None:
@@ -78,9 +193,33 @@ async def job_search(search_term: str):
     return response
 
 
+@home_route.get('/search')
+async def search():
+    """
+        keyword search over job titles, companies, descriptions and skills
+    :return:
+    """
+    query: str = request.args.get('q', '').strip()
+    if not query:
+        return redirect(url_for('home.get_home'))
+    k: int = min(request.args.get('k', 50, type=int), 200)
+
+    filters = get_filters()
+    job_list, counts = scrapper.search_jobs(query=query, k=k, filters=filters, salary_range=get_salary_range(),
+                                            sort=request.args.get('sort'))
+    facets = create_facets(counts=counts, filters=filters)
+    seo = await create_tags(search_term=query)
+    context = dict(term=query, query=query, job_list=job_list, search_terms=scrapper.search_terms, seo=seo,
+                   facets=facets)
+    return render_template('index.html', **context)
+
+
 @home_route.get('/job/<string:reference>')
+@page_cache.cached(generation=lambda reference: scrapper.job_generation(job_reference=reference))
 async def job_detail(reference: str):
-    job: Job = await scrapper.job_search(job_reference=reference)
+    job: CompactJob = await scrapper.job_search(job_reference=reference)
+    if job is None:
+        return await not_found(search_term=reference)
 
     term = job.title
     seo = await create_tags(search_term=term)
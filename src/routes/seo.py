@@ -12,7 +12,7 @@ async def get_site_job_links() -> list[str]:
     :return:
     """
     links = []
-    for job in scrapper.jobs.values():
+    for job in scrapper.all_jobs():
         links.append(url_for('home.job_detail', _external=True, reference=job.job_ref))
     return links
 
@@ -1,17 +1,38 @@
-import re
 import asyncio
-import uuid
-from datetime import timedelta
+import os
+import threading
+import time
+from collections import Counter
+from datetime import date
 
-from bs4 import BeautifulSoup
 from flask import Flask
 from pydantic import ValidationError
-from requests_cache import CachedSession
 
 from src.cache import cached
 from src.logger import init_logger
 from src.database.models.jobs import Job
-from src.utils import format_reference
+from src.indexes import CategoryIndex, ExpiryIndex, FacetIndex, SalaryIndex, SearchIndex
+from src.config import config_instance
+from src.scrappers.client import HttpClient
+from src.scrappers.parsers import ParserPool
+from src.scrappers.scheduler import CrawlScheduler
+from src.scrappers.store import CompactJob, JobStore
+from src.snapshot import JobSnapshot, SnapshotError
+from src.utils import format_reference, parse_dates, process_memory
+
+
+def with_dates(listings: list[dict]) -> list[dict]:
+    """
+        parses the posted and expiration dates of a crawl's scraped jobs in one batch, the jobs then skip
+        parsing them one at a time while being validated
+    :param listings: scraped job fields, updated in place
+    :return: listings
+    """
+    dates = parse_dates(updated_times=[listing.get('updated_time') for listing in listings],
+                        expires=[listing.get('expires') for listing in listings])
+    for listing, (posted_date, expiration_date) in zip(listings, dates):
+        listing.update(posted_date=posted_date, expiration_date=expiration_date)
+    return listings
 
 
 class Scrapper:
@@ -38,45 +59,445 @@ class Scrapper:
             'Cache-Control': 'max-age=0',
             'Accept': '*/*'
         }
-        self.request_sessions = CachedSession('jobs.cache', use_cache_dir=False,
-                                              cache_control=True,
-                                              # Use Cache-Control response headers for expiration, if available
-                                              expire_after=timedelta(hours=12),
-                                              # Otherwise expire responses after one day
-                                              allowable_codes=[200, 400],
-                                              # Cache 400 responses as a solemn reminder of your failures
-                                              allowable_methods=['GET', 'POST'],
-                                              match_headers=['Accept-Language'],
-                                              # Cache a different response per language
-                                              stale_if_error=True
-                                              # In case of request errors, use stale cache data if possible
-                                              )
-
-        self.jobs: dict[str, Job] = {}
-
-    async def manage_jobs(self, jobs: list[Job]):
-        for job in jobs:
-            ref = format_reference(ref=job.job_ref)
-            self.jobs[ref] = job
+        self.http_client = HttpClient(headers=self.headers, limit_per_host=8)
+        settings = config_instance()
+        self.parser_pool = ParserPool(backend=settings.PARSER_BACKEND, max_workers=settings.PARSER_WORKERS)
+        self.snapshot_path: str | None = settings.SNAPSHOT_PATH
+        # detail pages confirmed within this many seconds are not requested again
+        self.revalidate_after: float = settings.REVALIDATE_AFTER
+        # listing pages are read until a page is mostly known jobs or the per term budget is spent
+        self.max_pages: int = settings.CRAWL_MAX_PAGES
+        self.known_ratio: float = settings.CRAWL_KNOWN_RATIO
+        self.logger = init_logger(self.__class__.__name__)
 
-    # noinspection PyBroadException
-    async def fetch_url(self, url: str) -> bytes | None:
+        self.jobs: JobStore = JobStore()
+        self.category_index = CategoryIndex()
+        self.search_index = SearchIndex()
+        self.facet_index = FacetIndex()
+        self.salary_index = SalaryIndex()
+        self.expiry_index = ExpiryIndex()
+        # bumped whenever jobs in a category change, cached pages are keyed on them
+        self.generations: dict[str, int] = {}
+        # bumped whenever jobs join or leave a category, which changes the counts shown on every page
+        self.membership_generation: int = 0
+        # detail page url -> when its job was last stored or confirmed unchanged
+        self.seen_links: dict[str, float] = {}
+        # detail page url -> ETag / Last-Modified of its last 200 response, used for conditional GETs
+        self.link_validators: dict[str, dict[str, str]] = {}
+        # pages fetched, skipped and revalidated during the current crawl
+        self.crawl_stats: Counter = Counter()
+        # "source/search term" -> listing pages read during the last crawl of that term
+        self.crawl_depths: dict[str, int] = {}
+        # crawls publish jobs from a background thread while requests read them
+        self._lock = threading.RLock()
+
+    def touch(self, categories: set[str], membership: bool = False):
+        """
+            invalidates cached pages built from the given categories
+        :param categories: normalized search terms
+        :param membership: jobs were added to or moved between categories
+        :return:
+        """
+        for category in categories:
+            self.generations[category] = self.generations.get(category, 0) + 1
+        if membership:
+            self.membership_generation += 1
+
+    def category_generation(self, search_term: str) -> tuple[int, int]:
+        return self.generations.get(self.category_index.normalize(search_term), 0), self.membership_generation
+
+    def job_generation(self, job_reference: str) -> int | None:
+        """
+            generation of the category holding a job, None when the job is not stored
+        :param job_reference:
+        :return:
+        """
+        category = self.category_index.category(format_reference(ref=job_reference))
+        if category is None:
+            return None
+        return self.generations.get(category, 0)
+
+    async def manage_jobs(self, jobs: list[Job], seen: float | None = None):
+        """
+            stores and indexes jobs, a job stored again replaces the previous one
+        :param jobs:
+        :param seen: when the jobs were confirmed on the site, defaults to now, 0.0 for jobs read back from
+            storage so the next crawl revalidates them
+        :return:
+        """
+        with self._lock:
+            categories: set[str] = set()
+            membership = False
+            seen = time.time() if seen is None else seen
+            for job in jobs:
+                self.seen_links[job.job_link] = seen
+                ref = format_reference(ref=job.job_ref)
+                category = self.category_index.normalize(job.search_term)
+                previous = self.category_index.category(ref)
+                if previous != category:
+                    membership = True
+                    if previous is not None:
+                        categories.add(previous)
+                categories.add(category)
+                self.jobs[ref] = job
+                self.category_index.add(ref=ref, search_term=job.search_term)
+                self.search_index.add(ref=ref, job=job)
+                self.facet_index.add(ref=ref, job=job)
+                self.salary_index.add(ref=ref, job=job)
+                self.expiry_index.add(ref=ref, job=job)
+            self.touch(categories=categories, membership=membership)
+
+    def load_snapshot(self) -> int:
+        """
+            restores the job store from the snapshot file, jobs are only decoded when first accessed
+        :return: number of jobs restored
+        """
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return 0
         try:
-            return self.request_sessions.get(url=url, headers=self.headers).content
-        except Exception as e:
+            snapshot = JobSnapshot(path=self.snapshot_path)
+        except (SnapshotError, OSError, ValueError) as e:
+            self.logger.error(f"Unable to load snapshot {self.snapshot_path} : {str(e)}")
+            return 0
+        with self._lock:
+            self.jobs.attach(snapshot=snapshot)
+            for ref in snapshot:
+                self.category_index.add(ref=ref, search_term=self.jobs.search_term(ref))
+            self.touch(categories=set(), membership=True)
+        self.logger.info(f"Restored {len(snapshot)} jobs from snapshot {self.snapshot_path}")
+        return len(snapshot)
+
+    def snapshot_mtime(self) -> int | None:
+        """
+            modification time of the snapshot file, followers reload when it changes
+        :return: None when there is no snapshot yet
+        """
+        try:
+            return os.stat(self.snapshot_path).st_mtime_ns if self.snapshot_path else None
+        except OSError:
             return None
 
-    async def job_search(self, job_reference: str):
+    def reload_snapshot(self) -> int:
+        """
+            brings the store up to date with the latest snapshot, used by processes which follow the crawl of
+            another process
+
+            records are compared byte for byte with the snapshot followed so far, only jobs which are new or
+            changed are decoded and indexed and jobs left out of the snapshot are removed, unchanged jobs stay
+            as they are and those never accessed keep being read lazily from the new file
+        :return: number of jobs added or changed
+        """
+        try:
+            snapshot = JobSnapshot(path=self.snapshot_path)
+        except (SnapshotError, OSError, ValueError) as e:
+            self.logger.error(f"Unable to reload snapshot {self.snapshot_path} : {str(e)}")
+            return 0
+        with self._lock:
+            previous = self.jobs.snapshot
+            stored = set(self.jobs)
+        # decoded before the lock is taken so requests keep being served
+        changed: dict[str, CompactJob] = {}
+        for ref in snapshot:
+            data = snapshot.raw(ref)
+            if ref in stored and previous is not None and ref in previous and previous.raw(ref) == data:
+                continue
+            changed[ref] = CompactJob.decode(data)
+        removed = [ref for ref in stored if ref not in snapshot]
+
+        with self._lock:
+            for ref in removed:
+                self.remove_job(ref=ref)
+            categories: set[str] = set()
+            membership = bool(removed)
+            for ref, job in changed.items():
+                category = self.category_index.normalize(job.search_term)
+                previous_category = self.category_index.category(ref)
+                if previous_category != category:
+                    membership = True
+                    if previous_category is not None:
+                        categories.add(previous_category)
+                categories.add(category)
+                self.jobs[ref] = job
+                self.category_index.add(ref=ref, search_term=job.search_term)
+                self.search_index.add(ref=ref, job=job)
+                self.facet_index.add(ref=ref, job=job)
+                self.salary_index.add(ref=ref, job=job)
+                self.expiry_index.add(ref=ref, job=job)
+                self.seen_links[job.job_link] = snapshot.seen(ref)
+            # jobs which were not accessed yet are read from the new file from now on
+            self.jobs.attach(snapshot=snapshot)
+            self.touch(categories=categories, membership=membership)
+        self.logger.info(f"Reloaded snapshot {self.snapshot_path}, {len(changed)} jobs added or changed, "
+                         f"{len(removed)} removed, {len(snapshot) - len(changed)} unchanged")
+        return len(changed)
+
+    def save_snapshot(self) -> int:
+        """
+            writes every stored job into the snapshot file
+        :return: number of jobs written
+        """
+        # never replace a good snapshot with an empty store e.g. after a failed crawl
+        if not self.snapshot_path or not self.jobs:
+            return 0
+        with self._lock:
+            entries = [(ref, search_term, job, self.seen_links.get(job.job_link, 0.0)
+                        if isinstance(job, CompactJob) else self.jobs.snapshot_seen(ref))
+                       for ref, search_term, job in self.jobs.entries()]
+        # encoding is the bulk of the work, it runs outside the lock so requests reading the store are not held up
+        records = ((ref, search_term, JobStore.encode(job), seen) for ref, search_term, job, seen in entries)
+        try:
+            count = JobSnapshot.write(path=self.snapshot_path, records=records)
+        except OSError as e:
+            self.logger.error(f"Unable to save snapshot {self.snapshot_path} : {str(e)}")
+            return 0
+        self.logger.info(f"Saved {count} jobs to snapshot {self.snapshot_path}")
+        return count
+
+    def remove_job(self, ref: str):
+        """
+            drops a job from the store, every index and the crawl state
+        :param ref: formatted job reference
+        :return:
+        """
+        with self._lock:
+            if ref not in self.jobs:
+                return
+            job = self.jobs[ref]
+            category = self.category_index.category(ref)
+            del self.jobs[ref]
+            self.category_index.remove(ref=ref)
+            self.search_index.remove(ref=ref)
+            self.facet_index.remove(ref=ref)
+            self.salary_index.remove(ref=ref)
+            self.expiry_index.remove(ref=ref)
+            self.seen_links.pop(job.job_link, None)
+            self.link_validators.pop(job.job_link, None)
+            self.touch(categories={category} if category else set(), membership=True)
+
+    def evict_expired(self, today: date | None = None) -> int:
+        """
+            removes the jobs whose expiration date has passed
+        :param today: defaults to the current date
+        :return: number of jobs evicted
+        """
+        with self._lock:
+            refs = self.expiry_index.expired(today=today)
+            for ref in refs:
+                self.remove_job(ref=ref)
+        if refs:
+            self.logger.info(f"Evicted {len(refs)} expired jobs, {len(self.jobs)} jobs in store")
+        return len(refs)
+
+    def memory_stats(self) -> dict[str, int | None]:
+        """
+            gauge of what the store holds, sampled by the readiness endpoint
+        :return:
+        """
+        return dict(jobs=len(self.jobs), jobs_loaded=self.jobs.loaded_count(), jobs_expiring=len(self.expiry_index),
+                    seen_links=len(self.seen_links), rss_bytes=process_memory())
+
+    def all_jobs(self) -> list[CompactJob]:
+        """
+            point in time copy of the stored jobs, safe to iterate while a crawl is publishing
+        :return:
+        """
+        with self._lock:
+            return list(self.jobs.values())
+
+    def jobs_by_term(self, search_term: str) -> list[CompactJob]:
+        """
+            jobs in one category read from the category index, cost is independent of the store size
+        :param search_term:
+        :return:
+        """
+        with self._lock:
+            return [self.jobs[ref] for ref in self.category_index.refs(search_term=search_term)]
+
+    def filter_salary(self, refs: list[str], salary_range: tuple[float | None, float | None] | None = None,
+                      sort: str | None = None) -> list[str]:
+        """
+            narrows refs down to a monthly salary range and optionally orders them by salary or expiration date
+        :param refs:
+        :param salary_range: (low, high) monthly amounts, either bound may be None, None for no range
+        :param sort: "salary" lowest first or "-salary" highest first, "expires" closing soonest first or
+            "-expires" closing last first
+        :return:
+        """
+        if salary_range:
+            # refs are one category or one page of search results, checking each is cheaper than a catalog range
+            refs = self.salary_index.filter(refs=refs, low=salary_range[0], high=salary_range[1])
+        if sort in ("salary", "-salary"):
+            refs = self.salary_index.sort(refs=refs, reverse=sort == "-salary")
+        elif sort in ("expires", "-expires"):
+            refs = self.expiry_index.sort(refs=refs, reverse=sort == "-expires")
+        return refs
+
+    def browse(self, search_term: str, filters: dict[str, str] | None = None,
+               salary_range: tuple[float | None, float | None] | None = None,
+               sort: str | None = None, page: int = 1, per_page: int | None = None) -> tuple[list[CompactJob], dict, int]:
+        """
+            one page of jobs in a category narrowed down by facet filters together with the facet counts for
+            the whole result, only the jobs on the requested page are materialized
+        :param search_term: category
+        :param filters: facet field -> value, the category itself comes from search_term
+        :param salary_range: (low, high) monthly amounts
+        :param sort: "salary", "-salary", "expires" or "-expires", defaults to the category order
+        :param page: 1 based page number
+        :param per_page: jobs per page, None for every matching job
+        :return: jobs on the page, facet counts, total number of matching jobs
+        """
+        filters = {field: value for field, value in (filters or {}).items() if field != "search_term"}
+        with self._lock:
+            refs = self.category_index.refs(search_term=search_term)
+            if filters:
+                refs = self.facet_index.filter(refs=refs, filters=filters)
+            refs = self.filter_salary(refs=refs, salary_range=salary_range, sort=sort)
+            if filters or salary_range:
+                counts = self.facet_index.counts(refs=refs)
+            else:
+                counts = self.facet_index.counts(category=self.category_index.normalize(search_term))
+            # every category is offered for navigation, not only the current one
+            counts.update(self.facet_index.counts(fields=("search_term",), limit=len(self.search_terms)))
+            if per_page is not None:
+                start = (page - 1) * per_page
+                page_refs = refs[start:start + per_page]
+            else:
+                page_refs = refs
+            return [self.jobs[ref] for ref in page_refs], counts, len(refs)
+
+    def search_jobs(self, query: str, k: int = 20, filters: dict[str, str] | None = None,
+                    salary_range: tuple[float | None, float | None] | None = None,
+                    sort: str | None = None) -> tuple[list[CompactJob], dict]:
+        """
+            BM25 ranked full text search over titles, company names, descriptions and skills
+        :param query:
+        :param k: maximum number of jobs to return
+        :param filters: facet field -> value
+        :param salary_range: (low, high) monthly amounts
+        :param sort: "salary", "-salary", "expires" or "-expires", defaults to relevance
+        :return: jobs, facet counts of the matches
+        """
+        with self._lock:
+            # filters drop matches so rank a wider pool first
+            narrowed = bool(filters or salary_range)
+            results = self.search_index.search(query=query, k=k * 5 if narrowed else k)
+            refs = [ref for ref, _ in results if ref in self.jobs]
+            if filters:
+                refs = self.facet_index.filter(refs=refs, filters=filters)
+            refs = self.filter_salary(refs=refs, salary_range=salary_range, sort=sort)[:k]
+            return [self.jobs[ref] for ref in refs], self.facet_index.counts(refs=refs)
+
+    def index_stored_jobs(self, batch_size: int = 1000) -> int:
+        """
+            adds stored jobs which are not yet searchable e.g. restored from a snapshot, the lock is released
+            between batches so requests are not held up
+        :param batch_size:
+        :return: number of jobs indexed
+        """
+        with self._lock:
+            pending = [ref for ref in self.jobs if ref not in self.search_index]
+        for start in range(0, len(pending), batch_size):
+            with self._lock:
+                categories: set[str] = set()
+                for ref in pending[start:start + batch_size]:
+                    if ref in self.jobs and ref not in self.search_index:
+                        job = self.jobs[ref]
+                        self.search_index.add(ref=ref, job=job)
+                        self.facet_index.add(ref=ref, job=job)
+                        self.salary_index.add(ref=ref, job=job)
+                        self.expiry_index.add(ref=ref, job=job)
+                        # as current as when the crawl which wrote the snapshot last confirmed them
+                        self.seen_links.setdefault(job.job_link, self.jobs.snapshot_seen(ref))
+                        categories.add(self.category_index.category(ref))
+                # facet counts of these categories change as their jobs are indexed
+                self.touch(categories=categories, membership=bool(categories))
+        return len(pending)
+
+    async def fetch_url(self, url: str) -> bytes | None:
+        return await self.http_client.fetch(url=url)
+
+    async def fetch_urls(self, urls: list[str]) -> list[bytes | None]:
+        """
+            fetches all urls concurrently, results are returned in the same order as urls
+        :param urls:
+        :return:
+        """
+        return await asyncio.gather(*[self.fetch_url(url=url) for url in urls])
+
+    async def fetch_detail(self, url: str) -> bytes | None:
+        """
+            fetches a job detail page unless its job is already stored and current
+                - confirmed within revalidate_after seconds: skipped
+                - older and the site sent validators: conditional GET, 304 marks it current again
+                - otherwise: fetched in full
+        :param url:
+        :return: page body, None when skipped, not modified or failed
+        """
+        checked = self.seen_links.get(url)
+        if checked is not None and time.time() - checked < self.revalidate_after:
+            self.crawl_stats["detail_skipped"] += 1
+            return None
+
+        validators = self.link_validators.get(url)
+        if checked is not None and validators:
+            status, body, validators = await self.http_client.revalidate(url=url, validators=validators)
+        else:
+            status, body, validators = await self.http_client.request(url=url)
+        if status == 304:
+            self.seen_links[url] = time.time()
+            self.crawl_stats["detail_not_modified"] += 1
+            return None
+        if body is None:
+            self.crawl_stats["detail_failed"] += 1
+            return None
+        self.crawl_stats["detail_fetched"] += 1
+        if validators:
+            self.link_validators[url] = validators
+        return body
+
+    def is_page_known(self, links: list[str]) -> bool:
+        """
+            True when a listing page holds mostly jobs which are already stored, pages after it are older
+            still so reading further would not find new jobs
+        :param links: detail page urls on the listing page
+        :return:
+        """
+        if not links:
+            return True
+        known = sum(link in self.seen_links for link in links)
+        return known >= self.known_ratio * len(links)
+
+    def record_depth(self, source: str, search_term: str, depth: int):
+        self.crawl_depths[f"{source}/{search_term}"] = depth
+
+    async def fetch_details(self, urls: list[str]) -> list[bytes | None]:
+        """
+            incremental version of fetch_urls for job detail pages, see fetch_detail
+        :param urls:
+        :return:
+        """
+        return await asyncio.gather(*[self.fetch_detail(url=url) for url in urls])
+
+    async def close(self):
+        """
+            releases what a crawl holds, the http session and the parser worker processes
+        :return:
+        """
+        await self.http_client.close()
+        self.parser_pool.shutdown()
+
+    async def job_search(self, job_reference: str) -> CompactJob | None:
         """
             :param job_reference:
-            :return:
+            :return: None when the store is still empty e.g. while warming up
         """
         ref = format_reference(ref=job_reference)
-        try:
-            return self.jobs[ref]
-        except KeyError as e:
-            # In case of error return the last job
-            return self.jobs[list(self.jobs.keys())[-1]]
+        with self._lock:
+            try:
+                return self.jobs[ref]
+            except KeyError as e:
+                # In case of error return the last job
+                return self.jobs[next(reversed(self.jobs))] if self.jobs else None
 
 
 class JunctionScrapper:
@@ -91,92 +512,70 @@ class JunctionScrapper:
         self.logger = init_logger(self.__class__.__name__)
 
     async def init_loader(self):
-        # searches = []
-        for search_term in self.scrapper.search_terms:
-            self.logger.info(f"Searching for : {search_term}")
-            jobs_list = await self.junction_scrape(term=search_term)
-            await self.scrapper.manage_jobs(jobs=jobs_list)
+        await CrawlScheduler(scrapper=self.scrapper, sources=[self]).run()
 
     def init_app(self, app: Flask):
         asyncio.run(self.init_loader())
 
+    async def scrape(self, search_term: str, use_cache: bool = True) -> list[Job]:
+        """
+        :param search_term:
+        :param use_cache: False bypasses the cached result e.g. for scheduled refreshes
+        :return:
+        """
+        if not use_cache:
+            return await JunctionScrapper.junction_scrape.__wrapped__(self, term=search_term)
+        return await self.junction_scrape(term=search_term)
+
     @cached
-    async def junction_scrape(self, term: str, page_limit: int = 1) -> list[Job]:
+    async def junction_scrape(self, term: str, page_limit: int | None = None) -> list[Job]:
         """
-            given one search term scrape jobs
+            given one search term scrape jobs, detail pages for each listing page are downloaded concurrently
+
+            listing pages are read until one is made up mostly of known jobs or page_limit pages were read,
+            quiet terms stop after the first page while busy ones go as deep as they need
         :param term:
-        :param page_limit:
+        :param page_limit: maximum listing pages, defaults to the scrapper's per term budget
         :return:
         """
+        page_limit = page_limit or self.scrapper.max_pages
         jobs = []
-        for page in range(page_limit + 1):
-            if page == 0:
-                continue
-
+        depth = 0
+        for page in range(1, page_limit + 1):
             url = f"{self._jobs_base_url}{term}?page={page}"
             response: bytes | None = await self.scrapper.fetch_url(url=url)
 
             if not response:
                 self.logger.info(f"response : not OK")
-                continue
+                break
 
-            soup = BeautifulSoup(response, "html.parser")
-            job_elements = soup.find_all("div", class_="job-result")
+            depth = page
+            self.scrapper.crawl_stats["listing_fetched"] += 1
+            links: list[str] = await self.scrapper.parser_pool.junction_listing(
+                content=response, base_url=self._junction_base_url)
+            page_known = self.scrapper.is_page_known(links=links)
 
-            for job_element in job_elements:
-                show_more_link: str = job_element.find("a", class_="show-more")["href"]
-                link = f"{self._junction_base_url}{show_more_link.replace('/', '')}"
-                job_details: bytes | None = await self.scrapper.fetch_url(link)
+            # jobs which are already stored and unchanged are skipped
+            details: list[bytes | None] = await self.scrapper.fetch_details(urls=links)
+            for link, job_details in zip(links, details):
                 if job_details is None:
-                    self.logger.info("Job details not being fetched")
                     continue
-                job_soup = BeautifulSoup(job_details, "html.parser")
-                jobs.append(self.more_details(job_soup=job_soup, job_link=link, search_term=term))
+                jobs.append(self.scrapper.parser_pool.junction_detail(
+                    content=job_details, job_link=link, search_term=term))
+            if page_known:
+                break
 
+        self.scrapper.record_depth(source=self.__class__.__name__, search_term=term, depth=depth)
         jobs_results = await asyncio.gather(*jobs)
+        jobs_results = with_dates(listings=[job for job in jobs_results if job])
         try:
-            jobs = [Job(**job) for job in jobs_results if job]
+            jobs = [Job(**job) for job in jobs_results]
             self.logger.info(f"Gathered a total of {len(jobs)} jobs using {str(self.__class__.__name__)} using search term: {term}")
             return jobs
         except ValidationError as e:
             self.logger.info(f"Error creating Job Model: {str(e)}")
             return []
 
-    @staticmethod
-    async def more_details(job_soup, job_link: str, search_term: str):
-        try:
-            job_element = job_soup.find("div", class_="job-description")
-
-            job_dict = {"search_term": search_term,
-                        "logo_link": job_element.find("img")["src"],
-                        "title": job_element.find("h1").text.strip(),
-                        "job_link": job_link,
-                        "company_name": job_element.find("h2").text.strip(),
-                        "salary": job_element.find("li", class_="salary").text.strip(),
-                        "position": job_element.find("li", class_="position").text.strip(),
-                        "location": job_element.find("li", class_="location").text.strip(),
-                        "updated_time": job_element.find("li", class_="updated-time").text.strip(),
-                        "expires": job_element.find("li", class_="expires").text.strip(),
-                        "job_ref": job_element.find("li", class_="cjun-job-ref").text.strip()}
-
-            description_element = job_soup.find("div", class_="job-desc-on-expired")
-            job_description = description_element.find("div", class_="job-details").text.strip()
-
-            # Extract and print the desired skills
-            try:
-                desired_skills_element = description_element.find_all("ul")[0]
-                desired_skills = [skill.text.strip() for skill in desired_skills_element.find_all("li") if skill]
-
-            except IndexError:
-                desired_skills = []
-
-            job_dict['description'] = job_description
-            job_dict['desired_skills'] = desired_skills
-
-            return job_dict
-        except AttributeError as e:
-            return
-
 
 class CareerScrapper:
     def __init__(self, scrapper: Scrapper):
@@ -185,114 +584,66 @@ class CareerScrapper:
         self.logger = init_logger(self.__class__.__name__)
 
     async def init_loader(self):
-        searches = []
-        for search_term in self.scrapper.search_terms:
-            jobs_list = await self.career_scrape(search_term=search_term)
-            await self.scrapper.manage_jobs(jobs=jobs_list)
+        await CrawlScheduler(scrapper=self.scrapper, sources=[self]).run()
 
     def init_app(self, app: Flask):
         asyncio.run(self.init_loader())
 
+    async def scrape(self, search_term: str, use_cache: bool = True) -> list[Job]:
+        """
+        :param search_term:
+        :param use_cache: False bypasses the cached result e.g. for scheduled refreshes
+        :return:
+        """
+        if not use_cache:
+            return await CareerScrapper.career_scrape.__wrapped__(self, search_term=search_term)
+        return await self.career_scrape(search_term=search_term)
+
     # noinspection PyBroadException
     @cached
-    async def career_scrape(self, search_term: str) -> list[Job]:
+    async def career_scrape(self, search_term: str, page_limit: int | None = None) -> list[Job]:
+        """
+            listing pages are read until one is made up mostly of known jobs or page_limit pages were read
+        :param search_term:
+        :param page_limit: maximum listing pages, defaults to the scrapper's per term budget
+        :return:
+        """
         base_url = f"https://www.careers24.com/jobs/kw-{search_term}/"
-        response = await self.scrapper.fetch_url(url=base_url)
-        if response is None:
-            return []
-
-        soup = BeautifulSoup(response, 'html.parser')
-        job_listings = soup.find_all("div", class_="job-card")
+        page_limit = page_limit or self.scrapper.max_pages
+        listings: list[dict] = []
+        details: list[bytes | None] = []
+        depth = 0
+        for page in range(1, page_limit + 1):
+            response = await self.scrapper.fetch_url(url=base_url if page == 1 else f"{base_url}?page={page}")
+            if response is None:
+                break
+
+            depth = page
+            self.scrapper.crawl_stats["listing_fetched"] += 1
+            page_listings: list[dict] = await self.scrapper.parser_pool.career_listing(
+                content=response, search_term=search_term)
+            links = [listing['job_link'] for listing in page_listings]
+            page_known = self.scrapper.is_page_known(links=links)
+
+            # Now, let's navigate to the apply links and extract more details about the jobs, all at once
+            listings.extend(page_listings)
+            details.extend(await self.scrapper.fetch_details(urls=links))
+            if page_known:
+                break
+
+        self.scrapper.record_depth(source=self.__class__.__name__, search_term=search_term, depth=depth)
+        fetched = [(listing, job_details_response) for listing, job_details_response in zip(listings, details)
+                   if job_details_response]
+        parsed = await asyncio.gather(*[
+            self.scrapper.parser_pool.career_detail(content=job_details_response, company_name=listing['company_name'])
+            for listing, job_details_response in fetched])
         jobs = []
-        for job in job_listings:
-            title = job.find("h2").text.strip()
-            image_tag = job.find("img")
-
-            if image_tag:
-                company_name = job.find("img")["alt"]
-                logo_link = job.find("img")["src"]
-            else:
-                company_name = None
-                logo_link = None
-
-            extra_data = job.find_all("li")
-            expires, job_type, location, updated_time = await self.extra_data_(extra_data)
-            try:
-                job_link = job.find("i")["data-url"]
-            except KeyError:
+        with_dates(listings=[listing for listing, _ in fetched])
+        for (listing, _), (company_name, description, job_ref, salary) in zip(fetched, parsed):
+            if salary is None and job_ref is None:
                 continue
 
-            # Now, let's navigate to the apply_link and extract more details about the job
-            job_details_response = await self.scrapper.fetch_url(job_link)
-            if job_details_response:
-                company_name, description, job_ref, salary = await self.extract_job_details(
-                    company_name=company_name, job_details_response=job_details_response)
-                if salary is None and job_ref is None:
-                    continue
-
-                jobs.append(Job(**dict(search_term=search_term,
-                                       title=title,
-                                       logo_link=logo_link,
-                                       job_link=job_link,
-                                       company_name=company_name,
-                                       salary=salary, position=job_type, location=location,
-                                       updated_time=updated_time,
-                                       expires=expires, job_ref=job_ref, description=description)))
+            listing.update(company_name=company_name, salary=salary, job_ref=job_ref, description=description)
+            jobs.append(Job(**listing))
         self.logger.info(f"Found {len(jobs)} Jobs with {str(self.__class__.__name__)} using search term : {search_term}")
         return jobs
-
-    async def extra_data_(self, extra_data):
-        if len(extra_data) >= 3:
-            location = extra_data[0].get_text(strip=True)
-            job_type = extra_data[1].get_text(strip=True)
-            job_type = job_type.split(":")[1]
-            posted_date_line = extra_data[2].get_text(strip=False)
-            updated_time, expires = await self.parse_posted_date(date_line=posted_date_line.strip())
-        else:
-            location = "N/A"
-            job_type = "N/A"
-            updated_time = "N/A"
-            expires = "N/A"
-        return expires, job_type, location, updated_time
-
-    @staticmethod
-    async def extract_job_details(company_name, job_details_response):
-        try:
-            job_details_soup = BeautifulSoup(job_details_response, 'html.parser')
-            vacancy_details = job_details_soup.find("div", class_="c24-vacancy-deatils-container")
-
-            def find_text_or_default(element, default="N/A"):
-                return element.text.strip() if element else default
-
-            salary_tag = vacancy_details.find("li", string="Salary:")
-            salary = find_text_or_default(salary_tag.find_next("li", class_="elipses")).split(":")[1]
-
-            sectors_tag = vacancy_details.find("li", class_="c24-sectr")
-            sectors = [sector.text.strip() for sector in sectors_tag.find_all("a")] if sectors_tag else []
-
-            reference_tags = vacancy_details.find("ul", class_="small-text").find_all("li")
-            job_ref = find_text_or_default(reference_tags[-1])
-            if not job_ref:
-                job_ref = str(uuid.uuid4())
-            if "/" in job_ref:
-                job_ref = job_ref.split("/")[0]
-
-            description = find_text_or_default(vacancy_details.find("div", class_="v-descrip"))
-            if not company_name:
-                company_name = find_text_or_default(vacancy_details.find("p", class_="mb-15"), default="N/A")
-
-            return company_name, description, job_ref, salary
-        except AttributeError:
-            return None, None, None, None
-
-    @staticmethod
-    async def parse_posted_date(date_line: str):
-        separators = ["\n61", "<br\>", "<br>"]
-
-        for separator in separators:
-            if separator in date_line:
-                parts = date_line.split(separator)
-                if len(parts) == 2:
-                    return parts[0].strip(), parts[1].strip()
-
-        return "N/A", "N/A"
@@ -0,0 +1,134 @@
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from src.logger import init_logger
+
+
+class TokenBucket:
+    """
+    **TokenBucket**
+        refills at rate tokens per second up to capacity, every request to a host takes one token
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens: float = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class HttpClient:
+    """
+    **HttpClient**
+        non-blocking HTTP client used by the scrappers, detail pages for a listing page are fetched
+        concurrently while the connector caps the number of open connections per host
+
+        politeness: each host gets its own token bucket (rate_per_host requests per second with bursts
+        of up to burst requests) and max_in_flight caps the requests in flight across all hosts
+    """
+
+    def __init__(self, headers: dict[str, str], limit_per_host: int = 8, max_in_flight: int = 32,
+                 rate_per_host: float = 10.0, burst: int = 20, timeout: int = 30):
+        self.headers = headers
+        self.limit_per_host = limit_per_host
+        self.max_in_flight = max_in_flight
+        self.rate_per_host = rate_per_host
+        self.burst = burst
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.logger = init_logger(self.__class__.__name__)
+        self._session: aiohttp.ClientSession | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._in_flight: asyncio.Semaphore | None = None
+        self._buckets: dict[str, TokenBucket] = {}
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """
+            aiohttp sessions are bound to the event loop they were created on, the app runs
+            crawls through asyncio.run so a fresh session is created whenever the loop changes
+        :return:
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(limit=self.max_in_flight, limit_per_host=self.limit_per_host)
+            self._session = aiohttp.ClientSession(connector=connector, headers=self.headers,
+                                                  timeout=self.timeout)
+            self._loop = loop
+            # asyncio primitives are also bound to a loop
+            self._in_flight = asyncio.Semaphore(self.max_in_flight)
+            self._buckets = {}
+        return self._session
+
+    def bucket(self, host: str) -> TokenBucket:
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(rate=self.rate_per_host, capacity=self.burst)
+        return self._buckets[host]
+
+    # noinspection PyBroadException
+    async def request(self, url: str, headers: dict[str, str] | None = None) -> tuple[int | None, bytes | None, dict[str, str]]:
+        """
+            politely fetches url
+        :param url:
+        :param headers: extra request headers e.g. conditional GET validators
+        :return: status (None if the request failed), body on 200, response validators (ETag / Last-Modified)
+        """
+        session = await self.get_session()
+        host = urlsplit(url).netloc
+        # wait for the host's token first so throttled hosts do not hold global slots
+        await self.bucket(host).acquire()
+        async with self._in_flight:
+            try:
+                async with session.get(url, headers=headers) as response:
+                    validators = {name: response.headers[name] for name in ("ETag", "Last-Modified")
+                                  if name in response.headers}
+                    if response.status != 200:
+                        if response.status != 304:
+                            self.logger.info(f"{host} responded with : {response.status}")
+                        return response.status, None, validators
+                    return response.status, await response.read(), validators
+            except Exception as e:
+                self.logger.info(f"Error fetching {url} : {str(e)}")
+                return None, None, {}
+
+    async def fetch(self, url: str) -> bytes | None:
+        """
+            will fetch url and return the response body or None if the request failed
+        :param url:
+        :return:
+        """
+        _, body, _ = await self.request(url=url)
+        return body
+
+    async def revalidate(self, url: str, validators: dict[str, str]) -> tuple[int | None, bytes | None, dict[str, str]]:
+        """
+            conditional GET, a 304 status means the page has not changed since the validators were issued
+        :param url:
+        :param validators: ETag / Last-Modified of the previous response
+        :return: status, body on 200, new validators
+        """
+        headers = {}
+        if "ETag" in validators:
+            headers["If-None-Match"] = validators["ETag"]
+        if "Last-Modified" in validators:
+            headers["If-Modified-Since"] = validators["Last-Modified"]
+        return await self.request(url=url, headers=headers)
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
@@ -0,0 +1,58 @@
+import os
+
+try:
+    import fcntl
+except ImportError:
+    # windows development machines run a single process, every process is the leader there
+    fcntl = None
+
+
+class CrawlLock:
+    """
+    **CrawlLock**
+        advisory file lock electing the one process on a host which crawls, the lock is held for the lifetime
+        of the process and released by the operating system when it exits so a follower can take over
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._file is not None
+
+    def acquire(self) -> bool:
+        """
+            tries to become the leader without blocking
+        :return: True when this process holds the lock
+        """
+        if self._file is not None:
+            return True
+        if fcntl is None:
+            self._file = open(os.devnull, "w")
+            return True
+
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        lock_file = open(self.path, "a+")
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(str(os.getpid()))
+        lock_file.flush()
+        self._file = lock_file
+        return True
+
+    def release(self):
+        if self._file is None:
+            return
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        self._file.close()
+        self._file = None
@@ -0,0 +1,72 @@
+import asyncio
+import atexit
+import functools
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from src.logger import init_logger
+from src.parsing import PARSER_BACKENDS, HTMLParser, parse
+
+
+class ParserPool:
+    """
+    **ParserPool**
+        ships raw pages to a pool of worker processes for parsing so that the event loop stays free for
+        network io and a crawl uses all cores, max_workers=0 parses on the calling thread
+    """
+
+    def __init__(self, backend: str = "html.parser", max_workers: int | None = None):
+        self.logger = init_logger(self.__class__.__name__)
+        self.backend = self._resolve_backend(backend=backend)
+        self.max_workers = max_workers
+        self._executor: Executor | None = None
+
+    def _resolve_backend(self, backend: str) -> str:
+        if backend not in PARSER_BACKENDS:
+            raise ValueError(f"Unknown parser backend : {backend}, choose one of {PARSER_BACKENDS}")
+        if backend == "selectolax" and HTMLParser is None:
+            self.logger.warning("selectolax is not installed falling back to html.parser")
+            return "html.parser"
+        return backend
+
+    @property
+    def executor(self) -> Executor | None:
+        if self._executor is None and self.max_workers != 0:
+            # the pool is started from a crawl thread of a threaded server, forked workers could inherit locks
+            # held by other threads e.g. logging, a fork server starts them from a clean single threaded process
+            context = multiprocessing.get_context(
+                "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn")
+            if context.get_start_method() == "forkserver":
+                # workers fork from a server which already imported the parsers
+                context.set_forkserver_preload(["src.parsing"])
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+            atexit.register(self.shutdown)
+        return self._executor
+
+    async def parse(self, kind: str, *args):
+        if self.executor is None:
+            return parse(kind, self.backend, *args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(parse, kind, self.backend, *args))
+
+    async def junction_listing(self, content: bytes, base_url: str) -> list[str]:
+        return await self.parse("junction_listing", content, base_url)
+
+    async def junction_detail(self, content: bytes, job_link: str, search_term: str) -> dict | None:
+        return await self.parse("junction_detail", content, job_link, search_term)
+
+    async def career_listing(self, content: bytes, search_term: str) -> list[dict]:
+        return await self.parse("career_listing", content, search_term)
+
+    async def career_detail(self, content: bytes, company_name: str | None) -> tuple:
+        return await self.parse("career_detail", content, company_name)
+
+    def shutdown(self):
+        """
+            stops the worker processes, they are started again by the next crawl
+        :return:
+        """
+        if self._executor is not None:
+            atexit.unregister(self.shutdown)
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
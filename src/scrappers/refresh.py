@@ -0,0 +1,171 @@
+import asyncio
+import random
+import threading
+import time
+from collections import Counter
+
+from flask import Flask
+
+from src.logger import init_logger
+
+
+class RefreshScheduler:
+    """
+    **RefreshScheduler**
+        keeps the store current after the warm-up crawl by recrawling each search term on its own jittered
+        interval, terms whose pages get more traffic are refreshed more often
+
+        the interval of a term moves from max_interval for terms nobody visits down to min_interval for the
+        busiest term, traffic counts are halved every decay_interval so priorities follow recent traffic
+
+        refreshes only run in the process which crawls i.e. once the crawl scheduler is ready, followers pick
+        the new jobs up from the snapshot written after every refresh
+    """
+
+    def __init__(self, crawl_scheduler, min_interval: float = 30 * 60, max_interval: float = 6 * 60 * 60,
+                 jitter: float = 0.1, decay_interval: float = 60 * 60):
+        self.crawl_scheduler = crawl_scheduler
+        self.scrapper = crawl_scheduler.scrapper
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.decay_interval = decay_interval
+        self.sweep_interval: float = 60 * 60
+        self.logger = init_logger(self.__class__.__name__)
+        self.traffic: Counter = Counter()
+        self.next_due: dict[str, float] = {}
+        self.last_run: dict[str, dict[str, float | int]] = {}
+        self.running: bool = False
+        # refresh tasks are counted apart from the warm-up progress of the crawl scheduler
+        self.tasks_done: int = 0
+        self.tasks_failed: int = 0
+        self._last_decay = time.time()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+        # a follower which takes over the crawl lock starts refreshing without waiting out its sleep
+        crawl_scheduler.state_listeners.append(lambda state: self._wake.set())
+
+    def record_hit(self, search_term: str | None):
+        if search_term in self.scrapper.search_terms:
+            self.traffic[search_term] += 1
+
+    def interval(self, search_term: str) -> float:
+        """
+            jittered refresh interval of a term given its share of the traffic
+        :param search_term:
+        :return: seconds
+        """
+        busiest = max(self.traffic.values(), default=0)
+        share = self.traffic[search_term] / busiest if busiest else 0.0
+        interval = self.max_interval - share * (self.max_interval - self.min_interval)
+        # jitter spreads the terms out so they do not all fall due at once
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def schedule(self, search_term: str, now: float | None = None):
+        self.next_due[search_term] = (now or time.time()) + self.interval(search_term)
+
+    def trigger(self, search_terms: list[str] | None = None) -> list[str]:
+        """
+            makes terms due immediately, the refresh runs on the scheduler thread
+        :param search_terms: None for every term
+        :return: the terms which were triggered
+        """
+        terms = [term for term in (search_terms or self.scrapper.search_terms) if term in self.scrapper.search_terms]
+        now = time.time()
+        for term in terms:
+            self.next_due[term] = now
+        self._wake.set()
+        return terms
+
+    def decay(self, now: float):
+        if now - self._last_decay < self.decay_interval:
+            return
+        self._last_decay = now
+        self.traffic = Counter({term: hits // 2 for term, hits in self.traffic.items() if hits > 1})
+
+    def due(self, now: float) -> list[str]:
+        return [term for term in self.scrapper.search_terms if self.next_due.get(term, 0) <= now]
+
+    async def refresh(self, search_terms: list[str]):
+        """
+            recrawls the given terms on every source, new and changed jobs are merged into the live store
+        :param search_terms:
+        :return:
+        """
+        started = time.time()
+        before = len(self.scrapper.jobs)
+        self.scrapper.crawl_stats.clear()
+        tasks = [self.crawl_scheduler.crawl_term(source=source, search_term=term, use_cache=False, warm_up=False)
+                 for source in self.crawl_scheduler.sources for term in search_terms]
+        try:
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            await self.scrapper.close()
+
+        self.tasks_done += len(results)
+        for result in results:
+            if isinstance(result, Exception):
+                self.tasks_failed += 1
+                self.logger.error(f"Refresh task failed : {str(result)}")
+        added = len(self.scrapper.jobs) - before
+        for term in search_terms:
+            self.last_run[term] = dict(started=started, finished=time.time(), hits=self.traffic[term])
+        self.logger.info(f"Refreshed {search_terms}, {added} new jobs, pages : {dict(self.scrapper.crawl_stats)}")
+        if added or self.scrapper.crawl_stats["detail_fetched"]:
+            await asyncio.to_thread(self.scrapper.save_snapshot)
+
+    def run_forever(self):
+        while True:
+            now = time.time()
+            # followers evict too, the jobs in the snapshot they follow expire on their own schedule
+            evicted = self.scrapper.evict_expired()
+            # nothing runs until the warm-up crawl of this process is over, followers never refresh, state
+            # changes wake the loop
+            if self.crawl_scheduler.state != "ready":
+                self._wake.wait(timeout=self.sweep_interval)
+                self._wake.clear()
+                continue
+            if evicted:
+                self.scrapper.save_snapshot()
+
+            for term in self.scrapper.search_terms:
+                if term not in self.next_due:
+                    self.schedule(search_term=term, now=now)
+            self.decay(now=now)
+            terms = self.due(now=now)
+            if terms:
+                self.running = True
+                try:
+                    asyncio.run(self.refresh(search_terms=terms))
+                except Exception as e:
+                    self.logger.error(f"Refresh failed : {str(e)}")
+                finally:
+                    self.running = False
+                finished = time.time()
+                for term in terms:
+                    self.schedule(search_term=term, now=finished)
+                continue
+
+            # wakes at least hourly so expired jobs are evicted even when no refresh is due
+            self._wake.wait(timeout=min(max(min(self.next_due.values()) - now, 0), self.sweep_interval))
+            self._wake.clear()
+
+    def status(self) -> dict:
+        now = time.time()
+        return dict(running=self.running, tasks_done=self.tasks_done, tasks_failed=self.tasks_failed, terms={
+            term: dict(due_in=round(self.next_due[term] - now, 1) if term in self.next_due else None,
+                       hits=self.traffic[term], last_run=self.last_run.get(term))
+            for term in self.scrapper.search_terms})
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self.run_forever, name="crawl-refresh", daemon=True)
+        self._thread.start()
+
+    def init_app(self, app: Flask, enabled: bool = True, min_interval: float | None = None,
+                 max_interval: float | None = None):
+        self.min_interval = min_interval or self.min_interval
+        self.max_interval = max_interval or self.max_interval
+        if enabled:
+            self.start()
@@ -0,0 +1,225 @@
+import asyncio
+import threading
+import time
+from typing import Callable, Iterable
+
+from flask import Flask
+
+from src.logger import init_logger
+from src.scrappers.leader import CrawlLock
+
+
+class CrawlScheduler:
+    """
+    **CrawlScheduler**
+        crawls every search term on every source at the same time, politeness is enforced per host
+        by the scrapper's http client so the total crawl time is bounded by the rate limits instead
+        of the sum of the terms
+    """
+
+    def __init__(self, scrapper, sources: list):
+        self.scrapper = scrapper
+        self.sources = sources
+        self.logger = init_logger(self.__class__.__name__)
+        # called with the new state whenever it changes e.g. to wake the refresh loop once this process crawls
+        self.state_listeners: list[Callable[[str], None]] = []
+        self._state: str = "idle"
+        self.tasks_total: int = 0
+        self.tasks_done: int = 0
+        self.tasks_failed: int = 0
+        self.started: float | None = None
+        self.finished: float | None = None
+        self._thread: threading.Thread | None = None
+        self.lock: CrawlLock | None = None
+        # writes the jobs of every crawled term to the database e.g. StorageController.store_jobs_to_database
+        self.store: Callable[[list], dict] | None = None
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    @state.setter
+    def state(self, state: str):
+        changed = state != self._state
+        self._state = state
+        if changed:
+            for listener in self.state_listeners:
+                listener(state)
+
+    @property
+    def is_ready(self) -> bool:
+        # a follower is ready once the leader has published a snapshot
+        return self.state == "ready" or (self.state == "following" and len(self.scrapper.jobs) > 0)
+
+    def status(self) -> dict[str, str | int | float | dict | None]:
+        """
+            warm-up progress reported by the readiness endpoint
+        :return:
+        """
+        elapsed = None
+        if self.started is not None:
+            elapsed = round((self.finished or time.time()) - self.started, 3)
+        return dict(state=self.state, tasks_total=self.tasks_total, tasks_done=self.tasks_done,
+                    tasks_failed=self.tasks_failed, jobs=len(self.scrapper.jobs), elapsed=elapsed,
+                    pages=dict(self.scrapper.crawl_stats), depths=dict(self.scrapper.crawl_depths),
+                    memory=self.scrapper.memory_stats())
+
+    async def crawl_term(self, source, search_term: str, use_cache: bool = True, warm_up: bool = True):
+        """
+            scrape a single term on a single source and publish the jobs as soon as they arrive
+        :param source:
+        :param search_term:
+        :param use_cache: False always scrapes instead of returning a cached result
+        :param warm_up: count the task in the warm-up progress, refreshes keep their own counts
+        :return:
+        """
+        self.logger.info(f"Searching for : {search_term} using {source.__class__.__name__}")
+        try:
+            jobs_list = await source.scrape(search_term=search_term, use_cache=use_cache)
+            await self.scrapper.manage_jobs(jobs=jobs_list)
+            await self.store_jobs(jobs_list=jobs_list)
+        except Exception:
+            if warm_up:
+                self.tasks_failed += 1
+            raise
+        finally:
+            if warm_up:
+                self.tasks_done += 1
+        return len(jobs_list)
+
+    async def store_jobs(self, jobs_list: list):
+        """
+            writes crawled jobs to the database on a worker thread, a failed write is logged and the crawl goes
+            on since the jobs are already served from the store
+        :param jobs_list:
+        :return:
+        """
+        if self.store is None or not jobs_list:
+            return
+        try:
+            await asyncio.to_thread(self.store, jobs_list)
+        except Exception as e:
+            self.logger.error(f"Unable to store jobs : {str(e)}")
+
+    async def run(self):
+        tasks = [self.crawl_term(source=source, search_term=search_term)
+                 for source in self.sources for search_term in self.scrapper.search_terms]
+        self.state = "crawling"
+        self.tasks_total, self.tasks_done, self.tasks_failed = len(tasks), 0, 0
+        self.started, self.finished = time.time(), None
+        self.scrapper.crawl_stats.clear()
+        try:
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            await self.scrapper.close()
+            self.state = "ready"
+            self.finished = time.time()
+
+        for result in results:
+            if isinstance(result, Exception):
+                self.logger.error(f"Crawl task failed : {str(result)}")
+        self.scrapper.evict_expired()
+        self.logger.info(f"Crawl finished, {len(self.scrapper.jobs)} jobs in store, pages : {dict(self.scrapper.crawl_stats)}")
+        await asyncio.to_thread(self.scrapper.save_snapshot)
+
+    def seed_store(self, seed: Callable[[], Iterable[list]], loop: asyncio.AbstractEventLoop) -> int:
+        """
+            reads the seed batches on a worker thread and publishes each batch as it arrives, only one batch
+            is held outside the store at a time
+        :param seed:
+        :param loop: event loop of the warm-up
+        :return: number of jobs seeded
+        """
+        seeded = 0
+        for jobs_list in seed():
+            # the database keeps no crawl times, seeded jobs are revalidated by the first crawl
+            asyncio.run_coroutine_threadsafe(self.scrapper.manage_jobs(jobs=jobs_list, seen=0.0), loop).result()
+            seeded += len(jobs_list)
+        return seeded
+
+    async def warm_up(self, seed: Callable[[], Iterable[list]] | None = None):
+        """
+            loads whatever data is available locally and then crawls, jobs are published as they arrive
+        :param seed: blocking callable yielding batches of jobs to serve while the crawl runs e.g. from the database
+        :return:
+        """
+        if seed is not None:
+            self.state = "seeding"
+            try:
+                seeded = await asyncio.to_thread(self.seed_store, seed, asyncio.get_running_loop())
+                self.logger.info(f"Seeded {seeded} jobs before crawling")
+            except Exception as e:
+                self.logger.error(f"Unable to seed jobs : {str(e)}")
+        # jobs restored from a snapshot or the database become searchable before the crawl starts
+        self.state = "indexing"
+        indexed = await asyncio.to_thread(self.scrapper.index_stored_jobs)
+        self.logger.info(f"Indexed {indexed} stored jobs for search")
+        await self.run()
+
+    def start_background(self, seed: Callable[[], Iterable[list]] | None = None):
+        """
+            runs the warm-up on its own thread and event loop so the app can serve requests immediately
+        :param seed:
+        :return:
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self.state = "starting"
+        self._thread = threading.Thread(target=asyncio.run, args=(self.warm_up(seed=seed),),
+                                        name="crawl-warm-up", daemon=True)
+        self._thread.start()
+
+    def follow(self, lock: CrawlLock, interval: float, seed: Callable[[], Iterable[list]] | None = None):
+        """
+            serves the snapshot published by the leader and reloads it whenever it is replaced, the lock is
+            retried on every poll so a follower takes over crawling when the leader exits
+        :param lock:
+        :param interval: seconds between polls
+        :param seed:
+        :return:
+        """
+        self.state = "following"
+        self.scrapper.index_stored_jobs()
+        followed = self.scrapper.snapshot_mtime()
+        while True:
+            if lock.acquire():
+                self.logger.info("Crawl lock acquired, this process is now crawling")
+                asyncio.run(self.warm_up(seed=seed))
+                return
+            mtime = self.scrapper.snapshot_mtime()
+            if mtime is not None and mtime != followed:
+                self.scrapper.reload_snapshot()
+                followed = mtime
+            time.sleep(interval)
+
+    def start_follower(self, lock: CrawlLock, interval: float, seed: Callable[[], Iterable[list]] | None = None):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self.state = "following"
+        self._thread = threading.Thread(target=self.follow, args=(lock, interval, seed),
+                                        name="crawl-follower", daemon=True)
+        self._thread.start()
+
+    def init_app(self, app: Flask, background: bool = False, seed: Callable[[], Iterable[list]] | None = None,
+                 lock: CrawlLock | None = None, follow_interval: float = 30.0,
+                 store: Callable[[list], dict] | None = None):
+        """
+            warms up the scrapper, with a lock only the process holding it crawls and the others follow its snapshot
+        :param app:
+        :param background: crawl on a background thread
+        :param seed:
+        :param lock: None crawls in every process
+        :param follow_interval: seconds between snapshot checks in follower processes
+        :param store: called with the jobs of every crawl and refresh task, only the crawling process writes
+        :return:
+        """
+        self.store = store
+        # the lock is released when the file is garbage collected, keep it for the lifetime of the process
+        self.lock = lock
+        if lock is not None and not lock.acquire():
+            self.logger.info(f"Another process holds {lock.path}, following its snapshot")
+            self.start_follower(lock=lock, interval=follow_interval, seed=seed)
+        elif background:
+            self.start_background(seed=seed)
+        else:
+            asyncio.run(self.warm_up(seed=seed))
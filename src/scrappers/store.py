@@ -0,0 +1,195 @@
+import functools
+import json
+import sys
+import zlib
+from collections.abc import MutableMapping
+from datetime import date
+from typing import Iterator
+
+from src.database.models.jobs import Job
+from src.snapshot import JobSnapshot
+from src.utils import format_description, parse_salary, parse_job_dates
+
+# jobs posted on the same day share one date object
+_iso_date = functools.lru_cache(maxsize=4096)(date.fromisoformat)
+
+
+class CompactJob:
+    """
+    **CompactJob**
+        memory lean form of a Job held by the store, attributes match Job so indexes and templates read either
+
+        slotted instead of a pydantic model, categorical strings are interned so every job in a category
+        shares them and the description and its html rendered at ingest are kept zlib compressed until a
+        detail page asks for them, snapshots leave the html out so restored jobs render it on first use
+    """
+    __slots__ = ("job_id", "search_term", "logo_link", "job_link", "title", "company_name", "salary", "position",
+                 "location", "updated_time", "expires", "job_ref", "_description", "desired_skills",
+                 "salary_min", "salary_max", "salary_period", "posted_date", "expiration_date",
+                 "_description_html")
+    INTERNED: tuple[str, ...] = ("search_term", "logo_link", "company_name", "salary", "position", "location",
+                                 "expires", "salary_period")
+    FIELDS: tuple[str, ...] = tuple(field.lstrip("_") for field in __slots__ if field != "_description_html")
+
+    def __init__(self, **fields):
+        if "salary_period" not in fields:
+            # records written before salaries were normalized
+            fields["salary_min"], fields["salary_max"], fields["salary_period"] = parse_salary(fields.get("salary"))
+        if "posted_date" not in fields:
+            # records written before dates were parsed at ingest
+            fields["posted_date"], fields["expiration_date"] = parse_job_dates(fields.get("updated_time"),
+                                                                               fields.get("expires"))
+        for field in ("posted_date", "expiration_date"):
+            if isinstance(fields.get(field), str):
+                fields[field] = _iso_date(fields[field])
+        for field in self.INTERNED:
+            value = fields.get(field)
+            fields[field] = sys.intern(value) if value is not None else None
+        description = fields.get("description")
+        self._description = zlib.compress(description.encode("utf-8")) if description is not None else None
+        description_html = fields.get("description_html")
+        self._description_html = zlib.compress(description_html.encode("utf-8")) \
+            if description_html is not None else None
+        skills = fields.get("desired_skills")
+        self.desired_skills = tuple(sys.intern(skill) for skill in skills) if skills is not None else None
+        for field in self.FIELDS:
+            if field not in ("description", "desired_skills"):
+                setattr(self, field, fields.get(field))
+
+    @classmethod
+    def from_job(cls, job: Job) -> "CompactJob":
+        return cls(**job.dict())
+
+    @classmethod
+    def decode(cls, data: bytes) -> "CompactJob":
+        """
+            builds a job straight from an encoded snapshot record, skipping model validation
+        :param data:
+        :return:
+        """
+        return cls(**json.loads(zlib.decompress(data)))
+
+    @property
+    def description(self) -> str | None:
+        return zlib.decompress(self._description).decode("utf-8") if self._description is not None else None
+
+    @property
+    def description_html(self) -> str:
+        if self._description_html is None:
+            description_html = format_description(description=self.description)
+            self._description_html = zlib.compress(description_html.encode("utf-8"))
+            return description_html
+        return zlib.decompress(self._description_html).decode("utf-8")
+
+    @property
+    def date_expires(self) -> date | None:
+        return self.expiration_date
+
+    def dict(self) -> dict:
+        data = {field: getattr(self, field) for field in self.FIELDS}
+        data["desired_skills"] = list(self.desired_skills) if self.desired_skills is not None else None
+        return data
+
+    def json(self) -> str:
+        return json.dumps(self.dict(), default=date.isoformat)
+
+    def to_job(self) -> Job:
+        return Job(**self.dict(), description_html=self.description_html)
+
+    def disp_dict(self) -> dict:
+        return self.to_job().disp_dict()
+
+    def __repr__(self):
+        return f"CompactJob({self.job_ref!r}, {self.title!r})"
+
+
+class JobStore(MutableMapping):
+    """
+    **JobStore**
+        mapping of formatted job_ref to job, jobs are held as CompactJob records and jobs restored from a
+        snapshot are only decoded on first access
+    """
+
+    def __init__(self):
+        # None marks a job which is still only held by the snapshot
+        self._jobs: dict[str, CompactJob | None] = {}
+        self._snapshot: JobSnapshot | None = None
+
+    def attach(self, snapshot: JobSnapshot):
+        self._snapshot = snapshot
+        # jobs already held in memory take precedence over the snapshot
+        self._jobs = {**dict.fromkeys(snapshot.index), **self._jobs}
+
+    @property
+    def snapshot(self) -> JobSnapshot | None:
+        return self._snapshot
+
+    def snapshot_seen(self, ref: str) -> float:
+        """
+            when the crawl which wrote the snapshot last confirmed a job, 0.0 for jobs the snapshot does not hold
+        :param ref:
+        :return:
+        """
+        return self._snapshot.seen(ref) if self._snapshot is not None and ref in self._snapshot else 0.0
+
+    def loaded_count(self) -> int:
+        return sum(job is not None for job in self._jobs.values())
+
+    def is_loaded(self, ref: str) -> bool:
+        return self._jobs.get(ref) is not None
+
+    def search_term(self, ref: str) -> str:
+        """
+            search term of a job without materializing it
+        :param ref:
+        :return:
+        """
+        job = self._jobs[ref]
+        return job.search_term if job is not None else self._snapshot.search_term(ref)
+
+    def entries(self) -> list[tuple[str, str, CompactJob | bytes]]:
+        """
+            (job_ref, search_term, job) of every stored job, jobs still held by the snapshot are their raw record,
+            nothing is encoded so it is cheap enough to take under the scrapper lock, see encode
+        :return:
+        """
+        snapshot = self._snapshot
+        return [(ref, job.search_term, job) if job is not None else (ref, snapshot.search_term(ref), snapshot.raw(ref))
+                for ref, job in self._jobs.items()]
+
+    @staticmethod
+    def encode(job: CompactJob | bytes) -> bytes:
+        """
+            snapshot record of an entry
+        :param job: in memory job or raw record
+        :return:
+        """
+        return job if isinstance(job, bytes) else zlib.compress(job.json().encode("utf-8"))
+
+    def __getitem__(self, ref: str) -> CompactJob:
+        job = self._jobs[ref]
+        if job is None:
+            job = CompactJob.decode(self._snapshot.raw(ref))
+            self._jobs[ref] = job
+        return job
+
+    def __setitem__(self, ref: str, job: Job | CompactJob):
+        self._jobs[ref] = job if isinstance(job, CompactJob) else CompactJob.from_job(job)
+
+    def __delitem__(self, ref: str):
+        del self._jobs[ref]
+
+    def __contains__(self, ref: object) -> bool:
+        return ref in self._jobs
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._jobs)
+
+    def __reversed__(self) -> Iterator[str]:
+        return reversed(self._jobs)
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def __repr__(self):
+        return f"JobStore({len(self)}, loaded={self.loaded_count()})"
@@ -0,0 +1,132 @@
+import json
+import mmap
+import os
+import struct
+import time
+from array import array
+from typing import Iterator
+
+MAGIC: bytes = b"JFSNAP01"
+# magic followed by the length of the json header
+PREAMBLE = struct.Struct(f"<{len(MAGIC)}sQ")
+
+
+class SnapshotError(Exception):
+    pass
+
+
+class JobSnapshot:
+    """
+    **JobSnapshot**
+        single file, memory mapped snapshot of the job store
+
+        layout: MAGIC | header length | json header | offsets | lengths | term ids | seen times | job refs | payload
+        the index arrays (native byte order) are read straight into typed arrays and the job refs into a dict keyed
+        by the formatted job_ref, records are zlib compressed json which is only decoded when a job is first accessed
+
+        seen times record when the crawl last stored or confirmed each job, version 1 files have none
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:
+            self._file.close()
+            raise SnapshotError(f"Empty snapshot : {path}") from e
+
+        magic, header_len = PREAMBLE.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise SnapshotError(f"Not a job snapshot : {path}")
+        position = PREAMBLE.size
+        header = json.loads(self._map[position:position + header_len])
+        position += header_len
+        self.created: float = header["created"]
+        self.terms: list[str] = header["terms"]
+        count: int = header["count"]
+
+        self.offsets = array("Q")
+        self.lengths = array("I")
+        self.term_ids = array("H")
+        self.seen_times = array("d")
+        index_arrays = [self.offsets, self.lengths, self.term_ids]
+        if header.get("version", 1) >= 2:
+            index_arrays.append(self.seen_times)
+        for index_array in index_arrays:
+            size = index_array.itemsize * count
+            index_array.frombytes(self._map[position:position + size])
+            position += size
+
+        refs = self._map[position:position + header["refs_len"]].decode("utf-8").split("\n") if count else []
+        self.index: dict[str, int] = dict(zip(refs, range(count)))
+        self._payload_start = position + header["refs_len"]
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, ref: str) -> bool:
+        return ref in self.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.index)
+
+    def search_term(self, ref: str) -> str:
+        return self.terms[self.term_ids[self.index[ref]]]
+
+    def seen(self, ref: str) -> float:
+        """
+            when the job was last stored or confirmed by a crawl
+        :param ref:
+        :return: 0.0 when unknown i.e. the next crawl revalidates it
+        """
+        return self.seen_times[self.index[ref]] if self.seen_times else 0.0
+
+    def raw(self, ref: str) -> bytes:
+        position = self.index[ref]
+        start = self._payload_start + self.offsets[position]
+        return self._map[start:start + self.lengths[position]]
+
+    def close(self):
+        if not self._map.closed:
+            self._map.close()
+        self._file.close()
+
+    @classmethod
+    def write(cls, path: str, records: Iterator[tuple[str, str, bytes]]) -> int:
+        """
+            writes the snapshot atomically, readers holding the previous file keep their mapping
+        :param path:
+        :param records: (job_ref, search_term, encoded job, seen time) tuples
+        :return: number of jobs written
+        """
+        offsets, lengths, term_ids, seen_times = array("Q"), array("I"), array("H"), array("d")
+        terms: dict[str, int] = {}
+        refs: list[str] = []
+        chunks: list[bytes] = []
+        offset = 0
+        for ref, search_term, data, seen in records:
+            refs.append(ref)
+            offsets.append(offset)
+            lengths.append(len(data))
+            term_ids.append(terms.setdefault(search_term, len(terms)))
+            seen_times.append(seen)
+            chunks.append(data)
+            offset += len(data)
+
+        refs_blob = "\n".join(refs).encode("utf-8")
+        header = dict(version=2, created=time.time(), count=len(refs), terms=list(terms), refs_len=len(refs_blob))
+        header_data = json.dumps(header, separators=(",", ":")).encode("utf-8")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(PREAMBLE.pack(MAGIC, len(header_data)))
+            f.write(header_data)
+            for index_array in (offsets, lengths, term_ids, seen_times):
+                f.write(index_array.tobytes())
+            f.write(refs_blob)
+            f.writelines(chunks)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        return len(refs)
@@ -1,6 +1,12 @@
+import os
 from os import path
+import functools
+import hashlib
+import html
+import inspect
 import re
-from datetime import date
+from datetime import date, datetime, timedelta
+from typing import Iterable
 from bs4 import BeautifulSoup
 
 
@@ -18,67 +24,57 @@ def format_title(title: str):
     return title.replace("-", " ").title()
 
 
-def format_description(description: str):
+DESCRIPTION_HEADINGS: tuple[str, ...] = (
+    "ABOUT THE POSITION",
+    "Job brief",
+    "Job responsibilities",
+    "Standards",
+    "Performance Qualification",
+    "Responsibilities",
+    "Client Details",
+    "Role Responsibilities",
+    "Relevant Qualifications",
+    "Experience",
+    "Your Expertise",
+    "Required Qualifications",
+    "Personal Attributes",
+    "Why work for us",
+    "Responsibilities and work outputs",
+    "Minimum requirements",
+    "Skills",
+    "Desired Skills",
+    "Requirements",
+    "Qualifications",
+    "Knowledge and Experience",
+    "About The Employer",
+    "Desired Work Experience",
+    "Desired Qualification Level"
+)
+# a line is a heading when it is one of the headings in any case, optionally followed by a colon
+HEADING_PATTERN = re.compile("(?:" + "|".join(map(re.escape, DESCRIPTION_HEADINGS)) + r")\s*:?", re.IGNORECASE)
+
+
+def format_description(description: str | None) -> str:
     """
     Parse the input description and create paragraphs using HTML based on headings.
 
     :param description: The input job description text.
-    :return: Formatted HTML representation of the description.
+    :return: Formatted HTML representation of the description, content is escaped.
     """
-    headings = [
-        "ABOUT THE POSITION",
-        "Job brief",
-        "Job responsibilities",
-        "Standards",
-        "Performance Qualification",
-        "Responsibilities",
-        "Client Details",
-        "Role Responsibilities",
-        "Relevant Qualifications",
-        "Experience",
-        "Your Expertise",
-        "Required Qualifications",
-        "Personal Attributes",
-        "Why work for us",
-        "Responsibilities and work outputs",
-        "Minimum requirements",
-        "Skills",
-        "Desired Skills",
-        "Requirements",
-        "Qualifications",
-        "Knowledge and Experience",
-        "About The Employer",
-        "Desired Work Experience",
-        "Desired Qualification Level"
-    ]
-
-    paragraphs = []
-    current_heading = None
+    if not description:
+        return ""
 
+    parts = []
     for line in description.splitlines():
         line = line.strip()
-
-        # Check if the line matches any of the headings
-        if line.casefold() in headings:
-            current_heading = line
-        elif current_heading:
-            # If there's a current heading, treat the line as content
-            if line:
-                paragraphs.append((current_heading, line))
-        else:
-            # If there's no current heading, treat the line as a regular paragraph
-            if line:
-                paragraphs.append(("paragraph", line))
-
-    # Generate HTML paragraphs based on the parsed content
-    html = ""
-    for heading, content in paragraphs:
-        if heading == "paragraph":
-            html += f"<p>{content}</p>\n"
+        if not line:
+            continue
+        if HEADING_PATTERN.fullmatch(line):
+            parts.append(f"<h2 class='card-title font-weight-bold'>{html.escape(line.rstrip(' :'))}</h2>")
         else:
-            html += f"<h2 class='card-title font-weight-bold'>{heading}</h2>\n<p>{content}</p>\n"
+            parts.append(f"<p>{html.escape(line)}</p>")
 
-    return html
+    return "\n".join(parts)
 
 
 def _format_description(description: str):
@@ -133,6 +129,149 @@ def format_reference(ref: str) -> str:
     return ref_without_special
 
 
+SALARY_AMOUNT = r"(\d{1,3}(?:[\s,]\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)\s?(k\b)?"
+# one quoted amount or range, the upper amount of a range often drops the currency e.g. "R25 000 - 41 667"
+SALARY_QUOTE = re.compile(rf"R\s?{SALARY_AMOUNT}(?:\s*(?:-|–|to)\s*(?:R\s?)?{SALARY_AMOUNT})?", re.IGNORECASE)
+SALARY_PERIODS: dict[str, re.Pattern] = {
+    "hour": re.compile(r"per\s+hour|hourly|p/h|\bph\b", re.IGNORECASE),
+    "day": re.compile(r"per\s+day|daily|p/d", re.IGNORECASE),
+    "week": re.compile(r"per\s+week|weekly|p/w", re.IGNORECASE),
+    "month": re.compile(r"per\s+month|monthly|p/m|\bpm\b|pmth", re.IGNORECASE),
+    "year": re.compile(r"per\s+annum|per\s+year|annual|yearly|p/a|p\.a\.?|\bpa\b|ctc", re.IGNORECASE),
+}
+# multipliers converting an amount for the period into a monthly amount
+MONTHLY_FACTORS: dict[str, float] = {"hour": 173.33, "day": 21.67, "week": 52 / 12, "month": 1.0, "year": 1 / 12}
+
+
+def _salary_amount(amount: str, thousands: str | None) -> float:
+    value = float(re.sub(r"[\s,]", "", amount))
+    return value * 1000 if thousands else value
+
+
+def parse_salary(salary: str | None) -> tuple[float | None, float | None, str | None]:
+    """
+        normalizes a free text salary such as "R25 000.00 - R41 667.00 Per Month" into monthly amounts
+
+    :param salary: salary as scraped
+    :return: minimum monthly amount, maximum monthly amount and the period the salary was quoted in,
+        all None when the salary holds no amount e.g. "Market Related"
+    """
+    if not salary:
+        return None, None, None
+    quote = SALARY_QUOTE.search(salary)
+    if quote is None:
+        return None, None, None
+    low, low_thousands, high, high_thousands = quote.groups()
+    amounts = [_salary_amount(amount=low, thousands=low_thousands)]
+    if high is not None:
+        amounts.append(_salary_amount(amount=high, thousands=high_thousands))
+        if amounts[1] < amounts[0]:
+            # not a range e.g. "R25 000 - 2 years experience"
+            del amounts[1]
+
+    # a later quote restates the first one in another period e.g. "From R12 000 per month (R144 000 pa)",
+    # only the first is used and its period is read from the text before the next quote
+    following = SALARY_QUOTE.search(salary, quote.end())
+    text = salary[:following.start()] if following is not None else salary
+    period = next((name for name, pattern in SALARY_PERIODS.items() if pattern.search(text)), None)
+    if period is None:
+        # unlabeled amounts above R100 000 are annual packages
+        period = "year" if max(amounts) >= 100_000 else "month"
+    factor = MONTHLY_FACTORS[period]
+    return round(min(amounts) * factor, 2), round(max(amounts) * factor, 2), period
+
+
+ABSOLUTE_DATE = re.compile(r"\d{4}-\d{2}-\d{2}|\d{1,2}/\d{1,2}/\d{4}|\d{1,2}\s+[A-Za-z]{3,9}\.?,?\s+\d{4}")
+DATE_FORMATS: tuple[str, ...] = ("%d %b %Y", "%d %B %Y", "%Y-%m-%d", "%d/%m/%Y")
+RELATIVE_DATE = re.compile(r"(\d+|an?)\s+(minute|hour|day|week|month)s?\b", re.IGNORECASE)
+RELATIVE_DAYS: dict[str, int] = {"minute": 0, "hour": 0, "day": 1, "week": 7, "month": 30}
+
+
+def _absolute_date(text: str) -> date | None:
+    match = ABSOLUTE_DATE.search(text)
+    if match is None:
+        return None
+    value = re.sub(r"[.,]", "", match.group())
+    value = re.sub(r"\s+", " ", value)
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _relative_days(text: str) -> int | None:
+    lowered = text.lower()
+    if "today" in lowered or "just now" in lowered:
+        return 0
+    if "yesterday" in lowered or "tomorrow" in lowered:
+        return 1
+    match = RELATIVE_DATE.search(text)
+    if match is None:
+        return None
+    count, unit = match.groups()
+    count = int(count) if count.isdigit() else 1
+    return count * RELATIVE_DAYS[unit.lower()]
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_job_dates(updated_time: str | None, expires: str | None, today: date) -> tuple[date | None, date | None]:
+    posted_date = None
+    if updated_time:
+        posted_date = _absolute_date(updated_time)
+        if posted_date is None:
+            days = _relative_days(updated_time)
+            posted_date = today - timedelta(days=days) if days is not None else None
+
+    expiration_date = None
+    if expires:
+        expiration_date = _absolute_date(expires)
+        if expiration_date is None:
+            days = _relative_days(expires)
+            # "Expires in 12 days" is a countdown shown on the day the page was scraped, not on the day the
+            # job was posted
+            expiration_date = today + timedelta(days=days) if days is not None else None
+    return posted_date, expiration_date
+
+
+def parse_job_dates(updated_time: str | None, expires: str | None,
+                    today: date | None = None) -> tuple[date | None, date | None]:
+    """
+        works out the posted and expiration dates of a job from the scraped text, understands
+        "Posted 12 Oct 2024 by ...", "Expires in 12 days" from Career Junction and the dated, relative
+        ("Posted 3 days ago", "Posted today") and "N/A" forms Careers24 returns
+
+    :param updated_time: posted line as scraped
+    :param expires: expiry line as scraped
+    :param today: day the page was scraped, relative dates count from it, defaults to the current date
+    :return: posted date and expiration date, either is None when it cannot be worked out
+    """
+    return _parse_job_dates(updated_time, expires, today or date.today())
+
+
+def parse_dates(updated_times: Iterable[str | None], expires: Iterable[str | None],
+                today: date | None = None) -> list[tuple[date | None, date | None]]:
+    """
+        parse_job_dates over whole columns for bulk loads, jobs scraped together share a handful of
+        distinct date lines so each distinct pair is parsed once
+
+    :param updated_times: posted lines
+    :param expires: expiry lines, in the same order
+    :param today: day the pages were scraped, defaults to the current date
+    :return: (posted date, expiration date) for every job in order
+    """
+    today = today or date.today()
+    parsed: dict[tuple[str | None, str | None], tuple[date | None, date | None]] = {}
+    results = []
+    for pair in zip(updated_times, expires):
+        dates = parsed.get(pair)
+        if dates is None:
+            dates = parsed[pair] = _parse_job_dates(pair[0], pair[1], today)
+        results.append(dates)
+    return results
+
+
 def number_days_to_expiry(updated_time: str, date_expires: date):
     """
 
@@ -143,6 +282,24 @@ def number_days_to_expiry(updated_time: str, date_expires: date):
     pass
 
 
+def process_memory() -> int | None:
+    """
+        resident set size of the current process in bytes
+    :return: None where it cannot be read
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        # peak rather than current usage, kilobytes on linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except ImportError:
+        return None
+
+
 def bootstrap_database():
     from src.database.sql.jobs import JobsORM
 
@@ -157,7 +314,24 @@ def sanitize_filename(filename):
     return filename.lower().strip()
 
 
-def generate_cache_key(f, *args, **kwargs):
-    # Construct the cache key using function name, args, and kwargs
-    cache_key = f"{f.__name__}{kwargs}"
-    return sanitize_filename(cache_key)
+def generate_cache_key(f, *args, **kwargs) -> str:
+    """
+        stable cache key for a call of f, positional and keyword arguments are bound to the signature of f
+        with defaults applied so every spelling of the same call shares a key, methods are keyed by the class
+        of the instance since the cache outlives the process
+    :param f:
+    :param args:
+    :param kwargs:
+    :return: function name followed by a hash of the full call
+    """
+    try:
+        bound = inspect.signature(f).bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+    except TypeError:
+        arguments = dict(args=args, kwargs=kwargs)
+    owner = arguments.pop("self", None)
+    owner_name = f"{type(owner).__module__}.{type(owner).__qualname__}" if owner is not None else ""
+    call = repr((f.__module__, f.__qualname__, owner_name, sorted(arguments.items())))
+    digest = hashlib.sha256(call.encode("utf-8")).hexdigest()[:32]
+    return f"{sanitize_filename(f.__name__)}-{digest}"
@@ -0,0 +1,10 @@
+import os
+import socket
+import tempfile
+
+# settings are read when src is first imported, tests never touch the configured databases, snapshot or log file
+_directory = tempfile.mkdtemp(prefix="jobfinders-tests-")
+os.environ.update(SECRET_KEY="test", CLIENT_SECRET="test", HOST_ADDRESSES="localhost", SNAPSHOT_PATH="",
+                  DEVELOPMENT_SERVER_NAME=socket.gethostname(), CACHE_DIRECTORY=os.path.join(_directory, "cache"),
+                  production_sql_db=f"sqlite:///{os.path.join(_directory, 'production.db')}",
+                  dev_sql_db=f"sqlite:///{os.path.join(_directory, 'development.db')}")
@@ -0,0 +1,122 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.cache import Cache, cached, route_cache
+from src.utils import generate_cache_key
+
+
+@pytest.fixture(autouse=True)
+def clear_route_cache():
+    route_cache.clear()
+    yield
+    route_cache.clear()
+
+
+async def search(term: str, page: int = 1, page_size: int = 20) -> list[str]:
+    return [term]
+
+
+class Source:
+    def __init__(self, name: str):
+        self.name = name
+
+    async def scrape(self, term: str, page_limit: int | None = None) -> list[str]:
+        return [term]
+
+
+def test_every_spelling_of_a_call_shares_a_key():
+    key = generate_cache_key(search, "nursing", 2)
+    assert generate_cache_key(search, "nursing", page=2) == key
+    assert generate_cache_key(search, term="nursing", page=2, page_size=20) == key
+    assert generate_cache_key(search, page=2, term="nursing") == key
+    assert generate_cache_key(search, "nursing") == generate_cache_key(search, "nursing", 1, 20)
+    assert generate_cache_key(search, "nursing", 3) != key
+    assert generate_cache_key(search, "finance", 2) != key
+    assert key.startswith("search-")
+
+
+def test_methods_are_keyed_by_class_not_instance():
+    first, second = Source(name="first"), Source(name="second")
+    assert generate_cache_key(Source.scrape, first, "nursing") == generate_cache_key(Source.scrape, second,
+                                                                                     term="nursing")
+    assert generate_cache_key(Source.scrape, first, "nursing") != generate_cache_key(search, "nursing")
+
+
+def test_concurrent_misses_run_the_call_once():
+    calls = []
+
+    @cached
+    async def slow_search(term: str) -> list[str]:
+        calls.append(term)
+        await asyncio.sleep(0.01)
+        return [term]
+
+    async def burst():
+        return await asyncio.gather(*[slow_search("nursing") for _ in range(10)], slow_search(term="nursing"))
+
+    assert asyncio.run(burst()) == [["nursing"]] * 11
+    assert calls == ["nursing"]
+    # the result is cached for later callers
+    assert asyncio.run(slow_search("nursing")) == ["nursing"]
+    assert calls == ["nursing"]
+
+
+def test_cancelled_waiter_does_not_cancel_the_shared_call():
+    calls = []
+
+    @cached
+    async def slow_search(term: str) -> list[str]:
+        calls.append(term)
+        await asyncio.sleep(0.05)
+        return [term]
+
+    async def cancel_one():
+        first = asyncio.ensure_future(slow_search("nursing"))
+        second = asyncio.ensure_future(slow_search("nursing"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(cancel_one()) == ["nursing"]
+    assert calls == ["nursing"]
+
+
+def test_empty_results_are_not_cached():
+    calls = []
+
+    @cached
+    async def empty_search(term: str) -> list[str]:
+        calls.append(term)
+        return []
+
+    assert asyncio.run(empty_search("nursing")) == []
+    assert asyncio.run(empty_search("nursing")) == []
+    assert calls == ["nursing", "nursing"]
+
+
+def test_flush_writes_files_without_holding_the_cache_lock(tmp_path):
+    cache = Cache(directory=str(tmp_path), flush_size=10 ** 9, flush_interval=10 ** 9)
+    cache.set("a", [1])
+    writing, release = threading.Event(), threading.Event()
+    persist = cache.persist
+
+    def slow_persist(key):
+        writing.set()
+        release.wait(timeout=5)
+        persist(key=key)
+
+    cache.persist = slow_persist
+    flusher = threading.Thread(target=cache.flush)
+    flusher.start()
+    assert writing.wait(timeout=5)
+    # readers and writers go on while the file is being written
+    assert cache.get("a") == [1]
+    cache.set("b", [2])
+    release.set()
+    flusher.join()
+    assert (tmp_path / "a.pkl").exists()
+    assert "b" in cache._dirty
@@ -0,0 +1,80 @@
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+
+from src.database.models.jobs import Job
+from src.indexes import ExpiryIndex
+from src.scrappers import Scrapper
+from src.utils import parse_job_dates
+
+# day the pages of these tests were scraped
+TODAY = date(2026, 10, 18)
+
+
+def make_job(ref: str, expires: str = "Expires in 20 days", updated_time: str = "Posted 01 Sep 2026 by Agent") -> Job:
+    posted_date, expiration_date = parse_job_dates(updated_time=updated_time, expires=expires, today=TODAY)
+    return Job(search_term="nursing", logo_link=None, job_link=f"https://example.com/{ref}", title=f"Nurse {ref}",
+               company_name="Clinic", salary="Market Related", position="Permanent", location="Cape Town",
+               updated_time=updated_time, expires=expires, job_ref=ref, description="Care for patients",
+               desired_skills=[], posted_date=posted_date, expiration_date=expiration_date)
+
+
+@pytest.fixture
+def scrapper() -> Scrapper:
+    return Scrapper()
+
+
+def test_relative_expiry_counts_from_scrape_date():
+    posted_date, expiration_date = parse_job_dates(updated_time="Posted 01 Sep 2026 by Agent",
+                                                   expires="Expires in 20 days", today=TODAY)
+    assert posted_date == date(2026, 9, 1)
+    assert expiration_date == TODAY + timedelta(days=20)
+
+
+def test_job_posted_long_ago_with_days_left_survives_eviction(scrapper):
+    job = make_job(ref="old-open")
+    asyncio.run(scrapper.manage_jobs(jobs=[job]))
+
+    assert scrapper.evict_expired(today=TODAY) == 0
+    assert "old-open" in scrapper.jobs
+    assert job.job_link in scrapper.seen_links
+
+
+def test_eviction_removes_lapsed_jobs_only(scrapper):
+    lapsed = make_job(ref="lapsed", expires="Closing Date: 10/10/2026")
+    open_job = make_job(ref="open", expires="Expires in 3 days")
+    asyncio.run(scrapper.manage_jobs(jobs=[lapsed, open_job]))
+
+    assert scrapper.evict_expired(today=TODAY) == 1
+    assert "lapsed" not in scrapper.jobs
+    assert lapsed.job_link not in scrapper.seen_links
+    assert scrapper.category_index.refs(search_term="nursing") == ["open"]
+    assert scrapper.evict_expired(today=TODAY + timedelta(days=4)) == 1
+    assert len(scrapper.jobs) == 0
+
+
+def test_expiry_index_sweep_pops_in_date_order():
+    index = ExpiryIndex()
+    for days, ref in ((5, "b"), (1, "a"), (9, "c")):
+        index.add(ref=ref, job=make_job(ref=ref, expires=f"Expires in {days} days"))
+
+    assert index.next_expiry() == TODAY + timedelta(days=1)
+    assert index.expired(today=TODAY + timedelta(days=6)) == ["a", "b"]
+    assert len(index) == 1
+    assert index.expired(today=TODAY + timedelta(days=6)) == []
+
+
+def test_expiry_index_skips_stale_entries():
+    index = ExpiryIndex()
+    index.add(ref="a", job=make_job(ref="a", expires="Expires in 1 days"))
+    index.add(ref="b", job=make_job(ref="b", expires="Expires in 2 days"))
+    # a moved later and b was removed, their first heap entries are stale
+    index.add(ref="a", job=make_job(ref="a", expires="Expires in 10 days"))
+    index.remove(ref="b")
+    index.add(ref="unknown", job=make_job(ref="unknown", expires="N/A"))
+
+    assert "unknown" not in index
+    assert index.expired(today=TODAY + timedelta(days=5)) == []
+    assert index.next_expiry() == TODAY + timedelta(days=10)
+    assert index.expired(today=TODAY + timedelta(days=11)) == ["a"]
@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.indexes import FacetIndex
+
+
+def job(search_term: str, location: str, position: str = "Permanent", company_name: str = "Acme"):
+    return SimpleNamespace(search_term=search_term, location=location, position=position, company_name=company_name)
+
+
+@pytest.fixture
+def index() -> FacetIndex:
+    index = FacetIndex()
+    index.add(ref="a", job=job("nursing", "Cape Town"))
+    index.add(ref="b", job=job("nursing", "cape  town", position="Contract"))
+    index.add(ref="c", job=job("nursing", "Durban"))
+    index.add(ref="d", job=job("finance", "Cape Town", company_name=None))
+    return index
+
+
+def counts(index: FacetIndex, field: str, **kwargs) -> list[tuple[str, int]]:
+    return [(label, count) for _, label, count in index.counts(fields=(field,), **kwargs)[field]]
+
+
+def test_counts_across_all_jobs_and_per_category(index):
+    # values are normalized, the first label seen is displayed
+    assert counts(index, "location") == [("Cape Town", 3), ("Durban", 1)]
+    assert counts(index, "location", category="nursing") == [("Cape Town", 2), ("Durban", 1)]
+    assert counts(index, "location", category="finance") == [("Cape Town", 1)]
+    assert counts(index, "company_name", category="finance") == [("N/A", 1)]
+    assert counts(index, "location", category="unknown") == []
+
+
+def test_counts_over_filtered_refs(index):
+    assert counts(index, "position", refs=["a", "b", "d"]) == [("Permanent", 2), ("Contract", 1)]
+    assert counts(index, "location", refs=[]) == []
+
+
+def test_counts_follow_removal(index):
+    index.remove(ref="a")
+    index.remove(ref="c")
+    assert counts(index, "location") == [("Cape Town", 2)]
+    assert counts(index, "location", category="nursing") == [("Cape Town", 1)]
+    assert counts(index, "position", category="nursing") == [("Contract", 1)]
+    index.remove(ref="b")
+    assert counts(index, "search_term") == [("finance", 1)]
+    assert counts(index, "location", category="nursing") == []
+    # removing an unknown reference is a no-op
+    index.remove(ref="b")
+    assert counts(index, "location") == [("Cape Town", 1)]
+
+
+def test_re_adding_moves_the_job(index):
+    index.add(ref="c", job=job("finance", "Cape Town"))
+    assert counts(index, "location") == [("Cape Town", 4)]
+    assert counts(index, "search_term") == [("nursing", 2), ("finance", 2)]
+    assert counts(index, "location", category="nursing") == [("Cape Town", 2)]
+
+
+def test_filter_keeps_order_and_matches_every_filter(index):
+    refs = ["d", "c", "b", "a"]
+    assert index.filter(refs=refs, filters={"location": "CAPE TOWN"}) == ["d", "b", "a"]
+    assert index.filter(refs=refs, filters={"location": "cape town", "position": "permanent"}) == ["d", "a"]
+    assert index.filter(refs=refs, filters={"location": "Pretoria"}) == []
+    assert index.filter(refs=refs, filters={}) == refs
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from src.cache.pages import page_cache
+from src.config import config_instance
+from src.database.models.jobs import Job
+from src.main import create_app, crawl_scheduler, refresh_scheduler, scrapper
+
+
+def make_job(ref: str, title: str = "Staff Nurse") -> Job:
+    return Job(search_term="nursing", logo_link=None, job_link=f"https://example.com/{ref}", title=title,
+               company_name="Clinic", salary="R20 000 per month", position="Permanent", location="Cape Town",
+               updated_time="Posted today", expires="Expires in 30 days", job_ref=ref,
+               description="Care for patients", desired_skills=[])
+
+
+@pytest.fixture(scope="module")
+def client():
+    # the app as create_app builds it, without the warm-up crawl and the refresh thread
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(crawl_scheduler, "init_app", lambda **kwargs: None)
+        patch.setattr(refresh_scheduler, "init_app", lambda **kwargs: None)
+        app = create_app(config=config_instance())
+    asyncio.run(scrapper.manage_jobs(jobs=[make_job(ref="page-0"), make_job(ref="page-1")]))
+    return app.test_client()
+
+
+@pytest.fixture(autouse=True)
+def clear_page_cache():
+    page_cache.clear()
+
+
+def test_etag_is_answered_with_not_modified(client):
+    response = client.get("/jobs/nursing")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    hits = page_cache.hits
+    cached = client.get("/jobs/nursing", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.data == b""
+    assert page_cache.hits == hits + 1
+    # the same page is served from the cache with the same ETag
+    assert client.get("/jobs/nursing").headers["ETag"] == etag
+
+
+def test_new_jobs_invalidate_the_category_pages(client):
+    etag = client.get("/jobs/nursing").headers["ETag"]
+    asyncio.run(scrapper.manage_jobs(jobs=[make_job(ref="page-2", title="Night Sister")]))
+
+    response = client.get("/jobs/nursing", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert b"Night Sister" in response.data
+
+
+def test_removed_jobs_invalidate_the_category_and_detail_pages(client):
+    asyncio.run(scrapper.manage_jobs(jobs=[make_job(ref="page-3", title="Ward Clerk")]))
+    listing_etag = client.get("/jobs/nursing").headers["ETag"]
+    detail = client.get("/job/page-1")
+    assert detail.status_code == 200
+    detail_etag = detail.headers["ETag"]
+    assert client.get("/job/page-1", headers={"If-None-Match": detail_etag}).status_code == 304
+
+    scrapper.remove_job(ref="page-3")
+    response = client.get("/jobs/nursing", headers={"If-None-Match": listing_etag})
+    assert response.status_code == 200
+    assert b"Ward Clerk" not in response.data
+    # detail pages of the category are rendered again, an unchanged body keeps its ETag
+    misses = page_cache.misses
+    assert client.get("/job/page-1", headers={"If-None-Match": detail_etag}).status_code == 304
+    assert page_cache.misses == misses + 1
+
+
+def test_not_found_pages_are_not_cached(client):
+    entries = len(page_cache)
+    for _ in range(2):
+        response = client.get("/jobs/unknown-category")
+        assert response.status_code == 404
+        assert "ETag" not in response.headers
+    assert len(page_cache) == entries
+
+
+def test_pages_past_the_last_one_are_not_found(client):
+    pages = len(scrapper.jobs_by_term("nursing"))
+    assert client.get(f"/jobs/nursing?per_page=1&page={pages}").status_code == 200
+    assert client.get(f"/jobs/nursing?per_page=1&page={pages + 1}").status_code == 404
+    assert client.get("/jobs/nursing?page=99").status_code == 404
+    assert client.get("/?page=99").status_code == 404
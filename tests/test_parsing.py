@@ -0,0 +1,74 @@
+import subprocess
+import sys
+
+import pytest
+
+from src.database.models.jobs import Job
+from src.parsing import PARSER_BACKENDS, parse
+
+JUNCTION_LISTING = b"""<html><body>
+<div class="job-result"><a class="show-more" href="/staff-nurse-1234/">more</a></div>
+<div class="job-result"><a class="show-more" href="/theatre-sister-5678/">more</a></div>
+</body></html>"""
+
+JUNCTION_DETAIL = """<html><body>
+<div class="job-description"><img src="https://cdn.example/logo.png"><h1> Staff Nurse </h1><h2>Clinic &amp; Co</h2>
+<ul><li class="salary">R25 000.00 - R41 667.00 Per Month</li><li class="position">Permanent</li>
+<li class="location">Cape Town</li><li class="updated-time">Posted 01 Oct 2026 by Agent</li>
+<li class="expires">Expires in 20 days</li><li class="cjun-job-ref">REF 1234</li></ul></div>
+<div class="job-desc-on-expired"><div class="job-details">Responsibilities
+Care for patients – day and night shifts
+Requirements
+Registered nurse<ul><li>Triage</li><li> Wound care </li></ul></div></div>
+</body></html>""".encode("utf-8")
+
+CAREER_LISTING = b"""<html><body>
+<div class="job-card"><h2> Bookkeeper </h2><img alt="Ledger Ltd" src="https://cdn.example/ledger.png">
+<ul><li>Durban</li><li>Job Type: Contract</li><li>Posted 3 days ago
+Closing Date: 30/10/2026</li></ul><i data-url="https://www.careers24.com/jobs/adverts/2001-bookkeeper/"></i></div>
+<div class="job-card"><h2>Clerk</h2><ul><li>Pretoria</li></ul></div>
+</body></html>"""
+
+CAREER_DETAIL = b"""<html><body><div class="c24-vacancy-deatils-container">
+<p class="mb-15">Ledger Ltd</p><ul><li>Salary:</li><li class="elipses">Salary: R18 000 per month</li></ul>
+<ul class="small-text"><li>Sector: Finance</li><li>2001/bookkeeper</li></ul>
+<div class="v-descrip"> Keep the books balanced. </div></div></body></html>"""
+
+
+@pytest.fixture(params=[backend for backend in PARSER_BACKENDS if backend != "html.parser"])
+def backend(request) -> str:
+    pytest.importorskip("selectolax" if request.param == "selectolax" else request.param)
+    return request.param
+
+
+def test_backends_agree_on_junction_pages(backend):
+    links = parse("junction_listing", backend, JUNCTION_LISTING, "https://www.careerjunction.co.za/")
+    assert links == parse("junction_listing", "html.parser", JUNCTION_LISTING, "https://www.careerjunction.co.za/")
+    assert links == ["https://www.careerjunction.co.za/staff-nurse-1234", "https://www.careerjunction.co.za/theatre-sister-5678"]
+
+    job = Job(**parse("junction_detail", backend, JUNCTION_DETAIL, links[0], "nursing"))
+    expected = Job(**parse("junction_detail", "html.parser", JUNCTION_DETAIL, links[0], "nursing"))
+    assert job.dict() == expected.dict()
+    assert (job.title, job.company_name, job.job_ref) == ("Staff Nurse", "Clinic & Co", "ref1234")
+    assert job.desired_skills == ["Triage", "Wound care"]
+
+
+def test_backends_agree_on_careers24_pages(backend):
+    listings = parse("career_listing", backend, CAREER_LISTING, "finance")
+    assert listings == parse("career_listing", "html.parser", CAREER_LISTING, "finance")
+    # cards without a link are skipped
+    assert len(listings) == 1
+
+    detail = parse("career_detail", backend, CAREER_DETAIL, None)
+    assert detail == parse("career_detail", "html.parser", CAREER_DETAIL, None)
+    company_name, description, job_ref, salary = detail
+    job = Job(**dict(listings[0], company_name=company_name, description=description, job_ref=job_ref, salary=salary))
+    assert (job.company_name, job.job_ref, job.position.strip(), job.expires) == (
+        "Ledger Ltd", "2001", "Contract", "Closing Date: 30/10/2026")
+
+
+def test_parsers_import_no_other_src_modules():
+    # worker processes unpickle the parsers, importing them must not pull in the scrappers package
+    code = "import sys, src.parsing; print(','.join(sorted(m for m in sys.modules if m.startswith('src'))))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "src,src.parsing"
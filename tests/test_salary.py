@@ -0,0 +1,72 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from src.indexes import SalaryIndex
+from src.utils import parse_salary
+
+
+def salary(salary_min: float | None, salary_max: float | None = None) -> SimpleNamespace:
+    return SimpleNamespace(salary_min=salary_min, salary_max=salary_max)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("R25 000.00 - R41 667.00 Per Month", (25000.0, 41667.0, "month")),
+    ("R25 000 - 41 667 per month", (25000.0, 41667.0, "month")),
+    ("From R12 000 per month (R144 000 pa)", (12000.0, 12000.0, "month")),
+    ("R 300 000 per annum", (25000.0, 25000.0, "year")),
+    ("R25k - R30k", (25000.0, 30000.0, "month")),
+    ("R18,000 to R22,000", (18000.0, 22000.0, "month")),
+    ("R1 500 000 CTC", (125000.0, 125000.0, "year")),
+    ("Market Related", (None, None, None)),
+    (None, (None, None, None)),
+])
+def test_parse_salary(text, expected):
+    assert parse_salary(salary=text) == expected
+
+
+@pytest.fixture
+def index() -> SalaryIndex:
+    index = SalaryIndex()
+    index.add(ref="low", job=salary(10_000, 15_000))
+    index.add(ref="mid", job=salary(20_000, 30_000))
+    index.add(ref="high", job=salary(40_000))
+    index.add(ref="unknown", job=salary(None))
+    return index
+
+
+def test_range_bounds_are_inclusive(index):
+    assert index.range(low=15_000, high=20_000) == ["low", "mid"]
+    assert index.range(low=30_001) == ["high"]
+    assert index.range(high=9_999) == []
+    assert index.range() == ["low", "mid", "high"]
+    assert "unknown" not in index
+
+
+def test_range_matches_brute_force():
+    rnd = random.Random(7)
+    index = SalaryIndex()
+    ranges = {}
+    for number in range(500):
+        low = rnd.randrange(5_000, 80_000, 500)
+        ranges[f"job-{number}"] = (low, low + rnd.choice((0, 5_000, 20_000)))
+        index.add(ref=f"job-{number}", job=salary(*ranges[f"job-{number}"]))
+    for ref in list(ranges)[::3]:
+        index.remove(ref=ref)
+        del ranges[ref]
+
+    for low, high in ((None, 20_000), (30_000, None), (25_000, 26_000), (1_000, 100_000), (90_000, None)):
+        expected = {ref for ref, (salary_min, salary_max) in ranges.items()
+                    if (high is None or salary_min <= high) and (low is None or salary_max >= low)}
+        found = index.range(low=low, high=high)
+        assert set(found) == expected
+        assert [ranges[ref][0] for ref in found] == sorted(ranges[ref][0] for ref in found)
+        assert index.filter(refs=sorted(ranges), low=low, high=high) == sorted(expected)
+
+
+def test_readding_moves_a_job(index):
+    index.add(ref="low", job=salary(50_000, 60_000))
+    assert index.range(high=15_000) == []
+    assert index.range(low=45_000) == ["low"]
+    assert index.sort(refs=["unknown", "low", "mid"], reverse=True) == ["low", "mid", "unknown"]
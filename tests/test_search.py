@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.indexes import SearchIndex
+from src.indexes.fulltext import tokenize
+
+
+def job(title: str, description: str = "", company_name: str = "Acme", desired_skills: tuple[str, ...] = ()):
+    return SimpleNamespace(title=title, description=description, company_name=company_name,
+                           desired_skills=list(desired_skills))
+
+
+@pytest.fixture
+def index() -> SearchIndex:
+    index = SearchIndex()
+    index.add(ref="nurse", job=job("Staff Nurse", description="Ward duties in a busy hospital"))
+    index.add(ref="sister", job=job("Theatre Sister", description="Assist the nurse in theatre"))
+    index.add(ref="developer", job=job("Python Developer", description="Build web services",
+                                       desired_skills=("python", "c++")))
+    index.add(ref="analyst", job=job("Data Analyst", description="Reports in python and excel"))
+    return index
+
+
+def test_tokenize_drops_stop_words_and_keeps_symbols():
+    assert tokenize("The C++ and C# Developer") == ["c++", "c#", "developer"]
+
+
+def test_title_match_ranks_above_description_mention(index):
+    assert [ref for ref, _ in index.search("nurse")] == ["nurse", "sister"]
+    assert [ref for ref, _ in index.search("python")] == ["developer", "analyst"]
+
+
+def test_scores_are_descending_and_limited_to_k(index):
+    results = index.search("python nurse theatre", k=3)
+    assert len(results) == 3
+    scores = [score for _, score in results]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_unknown_terms_match_nothing(index):
+    assert index.search("plumber") == []
+    assert SearchIndex().search("nurse") == []
+
+
+def test_remove_drops_the_job_and_its_postings(index):
+    index.remove(ref="nurse")
+    assert "nurse" not in index
+    assert len(index) == 3
+    assert [ref for ref, _ in index.search("nurse")] == ["sister"]
+    assert index.search("ward") == []
+    assert "ward" not in index._postings
+    # removing an unknown reference is a no-op
+    index.remove(ref="nurse")
+    assert len(index) == 3
+
+
+def test_re_adding_replaces_the_previous_entry(index):
+    index.add(ref="developer", job=job("Java Developer", description="Build web services"))
+    assert len(index) == 4
+    assert [ref for ref, _ in index.search("python")] == ["analyst"]
+    assert [ref for ref, _ in index.search("java")] == ["developer"]
+
+
+def test_champion_list_keeps_the_best_matches():
+    index = SearchIndex(champion_size=5)
+    for number in range(50):
+        index.add(ref=f"mention-{number}", job=job(f"Clerk {number}", description="nurse " + "filler " * number))
+    index.add(ref="title", job=job("Nurse"))
+    refs = [ref for ref, _ in index.search("nurse", k=3)]
+    assert refs == ["title", "mention-0", "mention-1"]
+    # changing the postings rebuilds the champion list
+    index.remove(ref="title")
+    assert [ref for ref, _ in index.search("nurse", k=1)] == ["mention-0"]
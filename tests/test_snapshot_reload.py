@@ -0,0 +1,36 @@
+import asyncio
+
+from src.database.models.jobs import Job
+from src.scrappers import Scrapper
+
+
+def make_job(ref: str, title: str) -> Job:
+    return Job(search_term="nursing", logo_link=None, job_link=f"https://example.com/{ref}", title=title,
+               company_name="Clinic", salary="R20 000 per month", position="Permanent", location="Cape Town",
+               updated_time="Posted today", expires="Expires in 30 days", job_ref=ref,
+               description="Care for patients", desired_skills=[])
+
+
+def test_follower_reload_only_indexes_changed_jobs(tmp_path):
+    path = str(tmp_path / "jobs.snapshot")
+    leader, follower = Scrapper(), Scrapper()
+    leader.snapshot_path = follower.snapshot_path = path
+    asyncio.run(leader.manage_jobs(jobs=[make_job(ref=f"job-{number}", title="Staff nurse") for number in range(5)]))
+    leader.save_snapshot()
+    follower.load_snapshot()
+    follower.index_stored_jobs()
+    unchanged = follower.jobs["job-2"]
+
+    leader.remove_job(ref="job-0")
+    asyncio.run(leader.manage_jobs(jobs=[make_job(ref="job-1", title="Theatre sister"),
+                                         make_job(ref="job-5", title="Staff nurse")]))
+    leader.save_snapshot()
+
+    assert follower.reload_snapshot() == 2
+    assert sorted(follower.jobs) == [f"job-{number}" for number in range(1, 6)]
+    # unchanged jobs are not decoded again
+    assert follower.jobs["job-2"] is unchanged
+    assert [job.job_ref for job in follower.search_jobs(query="theatre")[0]] == ["job-1"]
+    assert "job-0" not in follower.category_index.refs(search_term="nursing")
+    assert len(follower.search_jobs(query="staff nurse", k=10)[0]) == 4
+    assert follower.reload_snapshot() == 0
@@ -0,0 +1,103 @@
+import asyncio
+from datetime import date
+
+import pytest
+from sqlalchemy import delete, select
+
+from src.controllers.storage import StorageController
+from src.database.models.jobs import Job
+from src.database.sql import scoped_sessions
+from src.database.sql.jobs import JobsORM
+from src.scrappers import Scrapper
+from src.scrappers.refresh import RefreshScheduler
+from src.scrappers.scheduler import CrawlScheduler
+
+
+def make_job(ref: str, title: str = "Staff Nurse") -> Job:
+    return Job(search_term="nursing", logo_link=None, job_link=f"https://example.com/{ref}", title=title,
+               company_name="Clinic", salary="R25 000 - R30 000 per month", position="Permanent",
+               location="Cape Town", updated_time="Posted 01 Oct 2026 by Agent", expires="Expires in 20 days",
+               job_ref=ref, description="Care for patients", desired_skills=["triage"])
+
+
+@pytest.fixture
+def storage() -> StorageController:
+    JobsORM.create_if_not_table()
+    with scoped_sessions() as session:
+        session.execute(delete(JobsORM.__table__))
+        session.commit()
+    return StorageController()
+
+
+def stored_titles() -> dict[str, str]:
+    table = JobsORM.__table__
+    with scoped_sessions() as session:
+        return dict(session.execute(select(table.c.job_ref, table.c.title)).all())
+
+
+def test_upsert_counts_inserted_updated_and_unchanged(storage):
+    jobs = [make_job(ref=f"ref-{number}") for number in range(5)]
+    # a chunk size smaller than the batch spreads the jobs over three chunks
+    assert storage.store_jobs_to_database(jobs=jobs, chunk_size=2) == dict(inserted=5, updated=0, unchanged=0)
+    assert storage.store_jobs_to_database(jobs=jobs, chunk_size=2) == dict(inserted=0, updated=0, unchanged=5)
+
+    jobs[1] = make_job(ref="ref-1", title="Theatre Sister")
+    jobs[3] = make_job(ref="ref-3", title="Night Nurse")
+    jobs.append(make_job(ref="ref-5"))
+    assert storage.store_jobs_to_database(jobs=jobs, chunk_size=2) == dict(inserted=1, updated=2, unchanged=3)
+
+    titles = stored_titles()
+    assert len(titles) == 6
+    assert titles["ref-1"] == "Theatre Sister"
+    assert titles["ref-3"] == "Night Nurse"
+    assert titles["ref-5"] == "Staff Nurse"
+
+
+def test_upsert_keeps_the_last_copy_of_a_duplicated_job(storage):
+    jobs = [make_job(ref="ref-0"), make_job(ref="ref-1"), make_job(ref="ref-0", title="Theatre Sister"), None]
+    assert storage.store_jobs_to_database(jobs=jobs) == dict(inserted=2, updated=0, unchanged=0)
+    assert stored_titles() == {"ref-0": "Theatre Sister", "ref-1": "Staff Nurse"}
+
+
+def test_update_keeps_the_stored_job_id(storage):
+    storage.store_jobs_to_database(jobs=[make_job(ref="ref-0")])
+    table = JobsORM.__table__
+    with scoped_sessions() as session:
+        job_id = session.execute(select(table.c.job_id)).scalar_one()
+    # generated ids fit the VARCHAR(32) column
+    assert len(job_id) == 32
+    storage.store_jobs_to_database(jobs=[make_job(ref="ref-0", title="Theatre Sister")])
+    with scoped_sessions() as session:
+        assert session.execute(select(table.c.job_id, table.c.title)).one() == (job_id, "Theatre Sister")
+
+
+def test_salary_rounded_by_the_database_is_unchanged():
+    assert not StorageController.changed(108333.33, 108333.3)
+    assert StorageController.changed(108333.33, 108000.0)
+    assert StorageController.changed(25000.0, None)
+    assert not StorageController.changed(None, None)
+
+
+class Source:
+    """serves a fixed list of jobs for the nursing term"""
+
+    def __init__(self, jobs: list[Job]):
+        self.jobs = jobs
+
+    async def scrape(self, search_term: str, use_cache: bool = True) -> list[Job]:
+        return list(self.jobs) if search_term == "nursing" else []
+
+
+def test_crawls_and_refreshes_store_jobs_to_database(storage):
+    source = Source(jobs=[make_job(ref="ref-0"), make_job(ref="ref-1")])
+    crawl_scheduler = CrawlScheduler(scrapper=Scrapper(), sources=[source])
+    crawl_scheduler.store = storage.store_jobs_to_database
+    asyncio.run(crawl_scheduler.run())
+    assert stored_titles() == {"ref-0": "Staff Nurse", "ref-1": "Staff Nurse"}
+
+    source.jobs = [make_job(ref="ref-1", title="Theatre Sister"), make_job(ref="ref-2")]
+    asyncio.run(RefreshScheduler(crawl_scheduler=crawl_scheduler).refresh(search_terms=["nursing"]))
+    assert stored_titles() == {"ref-0": "Staff Nurse", "ref-1": "Theatre Sister", "ref-2": "Staff Nurse"}
+    # the database is the seed of the next boot
+    seeded = [job.job_ref for batch in storage.stream_jobs_from_database(today=date(2026, 10, 1)) for job in batch]
+    assert sorted(seeded) == ["ref-0", "ref-1", "ref-2"]